@@ -32,6 +32,9 @@ SCALE_CONFIG = {
     "password": "SWISSCAT",               # mot de passe pour décrypter le SessionId
     "verify": False,                      # en HTTPS: False ou chemin .cer ; en HTTP: ignoré
     "timeout_s": 8,
+    "notify_long_poll_s": 60,             # GetNotifications : attente max côté balance (long polling)
+    "tcp_keepidle_s": 60,                 # keepalive TCP : 1re sonde après 60 s d'inactivité…
+    "tcp_keepintvl_s": 15,                # … puis toutes les 15 s
     "autoconnect": True,                  # tenter la connexion automatique au démarrage
 
     # Paramètres portes (SetPosition)
@@ -40,6 +43,7 @@ SCALE_CONFIG = {
     "close_width": 0,
 
     "vial_presence_min_mg": 14000.0,  # min masse brute pour considérer qu'une vial est présente
+    "vial_presence_margin_mg": 2000.0,  # lecture Gross unique : marge ± autour du seuil, sinon lecture moyennée
 }
 
 # --- UR3 
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 from typing import Optional, List
+import selectors
 import socket
 import threading
+import time
 
 try:
     import rtde_io  # from ur-rtde
@@ -11,6 +13,8 @@ except ImportError:
 
 from config import UR3_CONFIG
 
+SELECT_TICK_S = 0.1  # pas d'attente du selector (cadence 100 ms)
+
 class UR3ConnectionError(RuntimeError):
     pass
 
@@ -35,7 +39,14 @@ class _UR3Client:
         self.disp_register: int = int(cfg.get("disp_rtde_input_register", 21))
 
         self._dash_sock: Optional[socket.socket] = None
+        self._sel: Optional[selectors.BaseSelector] = None
+        self._timeout_s: float = 3.0
+        self._rx_pending = bytearray()  # octets reçus au-delà de la dernière ligne lue
+        self._rx_buf = bytearray(1024)  # tampon de réception réutilisé (recv_into)
+        self._rx_mv = memoryview(self._rx_buf)
+        self._last_reply_mono: float = 0.0  # time.monotonic() de la dernière réponse Dashboard
         self._lock = threading.Lock()
+        self._reconnect = False  # socket fermé après un échange raté → reconnexion au prochain appel
         self._rtde_io = None  # RTDEIOInterface
 
     # --- Connexion Dashboard ---
@@ -43,52 +54,151 @@ class _UR3Client:
         self.close()
         try:
             dash = socket.create_connection((self.ip, self.dashboard_port), timeout=timeout_s)
-            dash.settimeout(timeout_s)
+            dash.setblocking(False)
             self._dash_sock = dash
+            self._timeout_s = float(timeout_s)
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(dash, selectors.EVENT_READ)
         except OSError as e:
             self.close()
             raise UR3ConnectionError(f"Erreur connexion UR3 ({self.ip}): {e}") from e
 
         banner = ""
         try:
-            data = self._dash_sock.recv(1024)
-            banner = data.decode(errors="ignore").strip()
-        except OSError:
+            banner = self._recv_line()
+        except UR3ConnectionError:
             banner = ""
         return banner
 
     def close(self) -> None:
+        sel = self._sel
+        if sel is not None:
+            try: sel.close()
+            except OSError: pass
+        self._sel = None
         s = self._dash_sock
         if s is not None:
             try: s.close()
             except OSError: pass
         self._dash_sock = None
+        self._rx_pending.clear()
+        self._reconnect = False
+
+    def _reset_dash(self) -> None:
+        """Échange interrompu (timeout, erreur, réponse partielle) : socket fermé et tampon
+        vidé, sinon une réponse tardive serait lue comme celle de la commande suivante.
+        Le prochain appel Dashboard se reconnecte."""
+        self.close()
+        self._reconnect = True
 
     def is_connected(self) -> bool:
-        return self._dash_sock is not None
+        # socket réinitialisé après un échange raté : toujours "connecté", reconnexion au prochain appel
+        return self._dash_sock is not None or self._reconnect
+
+    def seconds_since_reply(self) -> float:
+        """Secondes écoulées depuis la dernière réponse Dashboard reçue."""
+        return time.monotonic() - self._last_reply_mono
+
+    def is_socket_alive(self) -> bool:
+        """Liveness TCP sans trafic : SO_ERROR puis recv(MSG_PEEK) non bloquant (b"" = fermé par l'UR3)."""
+        s = self._dash_sock
+        if s is None:
+            return self._reconnect and self.ping()  # ping = reconnexion + vraie réponse
+        try:
+            if s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                return False
+            return s.recv(1, socket.MSG_PEEK) != b""
+        except BlockingIOError:
+            return True  # rien à lire : connexion ouverte
+        except OSError:
+            return False
 
     # --- Dashboard ---
     def _ensure_dash(self) -> socket.socket:
         if self._dash_sock is None:
-            raise UR3ConnectionError("Dashboard non connecté.")
+            if not self._reconnect:
+                raise UR3ConnectionError("Dashboard non connecté.")
+            self.connect(self._timeout_s)
         return self._dash_sock
 
-    def send_dashboard(self, cmd: str, expect_reply: bool = True) -> str:
-        with self._lock:
-            s = self._ensure_dash()
-            payload = (cmd.strip() + "\n").encode("ascii", errors="ignore")
+    def _wait(self, events: int, deadline: float) -> None:
+        """Attend que le socket Dashboard soit prêt (select par pas de SELECT_TICK_S)."""
+        s = self._ensure_dash()
+        self._sel.modify(s, events)
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise UR3ConnectionError("Timeout Dashboard.")
+                if self._sel.select(timeout=min(SELECT_TICK_S, remaining)):
+                    return
+        finally:
+            if events != selectors.EVENT_READ:
+                self._sel.modify(s, selectors.EVENT_READ)
+
+    def _send_all(self, payload: bytes) -> None:
+        s = self._ensure_dash()
+        deadline = time.monotonic() + self._timeout_s
+        view = memoryview(payload)
+        while view:
             try:
-                s.sendall(payload)
-            except OSError as e:
-                raise UR3ConnectionError(f"Erreur envoi Dashboard: {e}") from e
+                n = s.send(view)
+            except BlockingIOError:
+                self._wait(selectors.EVENT_WRITE, deadline)
+                continue
+            view = view[n:]
 
-            if not expect_reply:
-                return ""
+    def _recv_line(self) -> str:
+        """Lit une réponse Dashboard complète (terminée par '\\n')."""
+        s = self._ensure_dash()
+        deadline = time.monotonic() + self._timeout_s
+        pending = self._rx_pending
+        end = pending.find(b"\n")
+        while end < 0:
             try:
-                data = s.recv(4096)
+                k = s.recv_into(self._rx_mv)
+            except BlockingIOError:
+                self._wait(selectors.EVENT_READ, deadline)
+                continue
             except OSError as e:
                 raise UR3ConnectionError(f"Erreur lecture Dashboard: {e}") from e
-        return data.decode(errors="ignore").strip()
+            if not k:
+                raise UR3ConnectionError("Dashboard: connexion fermée par le robot.")
+            start = len(pending)
+            pending += self._rx_mv[:k]
+            end = pending.find(b"\n", start)
+        line = pending[:end].decode(errors="ignore").strip()
+        del pending[:end + 1]
+        self._last_reply_mono = time.monotonic()
+        return line
+
+    def _exchange(self, payload: bytes, n_replies: int) -> List[str]:
+        """Écrit payload puis lit n_replies lignes (appelant : sous self._lock).
+        Toute exception en cours d'échange → _reset_dash()."""
+        try:
+            try:
+                self._send_all(payload)
+            except OSError as e:
+                raise UR3ConnectionError(f"Erreur envoi Dashboard: {e}") from e
+            return [self._recv_line() for _ in range(n_replies)]
+        except Exception:
+            self._reset_dash()
+            raise
+
+    def send_dashboard(self, cmd: str, expect_reply: bool = True) -> str:
+        with self._lock:
+            payload = (cmd.strip() + "\n").encode("ascii", errors="ignore")
+            replies = self._exchange(payload, 1 if expect_reply else 0)
+            return replies[0] if replies else ""
+
+    def batch_dashboard(self, cmds: List[str]) -> List[str]:
+        """Envoie plusieurs commandes en une seule écriture, puis lit une réponse par commande.
+        Le serveur Dashboard traite les lignes dans l'ordre : 1 RTT au lieu de N."""
+        if not cmds:
+            return []
+        with self._lock:
+            payload = "".join(c.strip() + "\n" for c in cmds).encode("ascii", errors="ignore")
+            return self._exchange(payload, len(cmds))
 
     def ping(self) -> bool:
         try:
@@ -108,6 +218,15 @@ class _UR3Client:
     def get_program_state(self) -> str:   return self.send_dashboard("programState")
     def load_program(self, name: str) -> str: return self.send_dashboard(f"load {name}")
 
+    def play_with_state_probe(self, with_before: bool = True) -> tuple:
+        """play encadré des lectures programState, en une seule écriture pipelinée.
+        Retourne (état_avant | None, réponse_play, état_après)."""
+        if with_before:
+            before, resp, after = self.batch_dashboard(["programState", "play", "programState"])
+            return before, resp, after
+        resp, after = self.batch_dashboard(["play", "programState"])
+        return None, resp, after
+
     # --- SFTP listing ---
     def list_programs(self, recursive: bool = True) -> List[str]:
         try:
@@ -194,6 +313,9 @@ class UR3:
     def close(self):             return self._impl.close()
     def is_connected(self):      return self._impl.is_connected()
     def ping(self):              return self._impl.ping()
+    def seconds_since_reply(self): return self._impl.seconds_since_reply()
+    def is_socket_alive(self):   return self._impl.is_socket_alive()
+    def batch_dashboard(self, cmds): return self._impl.batch_dashboard(cmds)
 
     # Dashboard
     def get_robot_mode(self):    return self._impl.get_robot_mode()
@@ -207,6 +329,7 @@ class UR3:
     def get_loaded_program(self):  return self._impl.get_loaded_program()
     def get_program_state(self):   return self._impl.get_program_state()
     def load_program(self, name: str): return self._impl.load_program(name)
+    def play_with_state_probe(self, *a, **k): return self._impl.play_with_state_probe(*a, **k)
 
     # SFTP
     def list_programs(self, *a, **k): return self._impl.list_programs(*a, **k)
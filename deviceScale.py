@@ -22,6 +22,7 @@
 
 from __future__ import annotations
 from typing import Optional, List, Callable, Dict
+import socket
 import time
 import threading
 
@@ -32,10 +33,11 @@ from config import SCALE_CONFIG
 # ─────────────────────────────────────────────────────────────────────────────
 try:
     from zeep import Client, Settings
+    from zeep.cache import InMemoryCache
     from zeep.transports import Transport
     from zeep.helpers import serialize_object as _zeep_serialize
 except Exception:
-    Client = Settings = Transport = None
+    Client = Settings = Transport = InMemoryCache = None
     _zeep_serialize = None
 
 try:
@@ -82,19 +84,28 @@ def _with_session_retry(fn):
     """Décorateur : garantit une session ouverte ; si erreur 'Session' → réouvre et rejoue."""
     def _w(self, *a, **k):
         self._ensure_session()
+        sid = self.session_id
         try:
             return fn(self, *a, **k)
         except Exception as e:
             if "Session" in str(e):
-                self._open_session()
+                self._renew_session(sid)
                 return fn(self, *a, **k)
             raise
     _w.__name__ = fn.__name__
     return _w
 
 def _soap(self, svc_method, **payload):
-    """Appelle svc_method(**payload) + sérialise → dict si possible."""
-    resp = svc_method(**payload)
+    """Appelle svc_method(**payload) + sérialise → dict si possible.
+    Erreur réseau (OSError, dont requests.RequestException) → liaison perdue ;
+    succès → liaison établie (callback on_conn_change sur changement d'état)."""
+    try:
+        resp = svc_method(**payload)
+    except OSError:
+        self._set_link(False)
+        raise
+    self._last_ok_mono = time.monotonic()  # tout appel réussi prouve la liaison
+    self._set_link(True)
     return _serialize(resp)
 
 def _dig(obj, *keys):
@@ -156,6 +167,63 @@ def _ws_unit(u: Optional[str]) -> str:
     }.get(s, u)
 
 
+_MISS = object()  # sentinelle « pas en cache / trop vieux »
+
+
+class _RunningStats:
+    """Moyenne / écart-type en flux (Welford) : O(1) mémoire, pas de liste d'échantillons."""
+    __slots__ = ("n", "mean", "_m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        return (self._m2 / max(1, self.n - 1)) ** 0.5
+
+
+def _tcp_keepalive_options(idle_s: int = 60, intvl_s: int = 15, cnt: int = 4) -> list:
+    """SO_KEEPALIVE + réglages TCP_KEEP* quand la plateforme les expose (Linux, Windows ≥ 10, macOS)."""
+    opts = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, val in (("TCP_KEEPIDLE", idle_s), ("TCP_KEEPINTVL", intvl_s), ("TCP_KEEPCNT", cnt)):
+        opt = getattr(socket, name, None)
+        if opt is not None:
+            opts.append((socket.IPPROTO_TCP, opt, int(val)))
+    return opts
+
+
+def _keepalive_session(verify, pool_maxsize: int = 4):
+    """requests.Session persistante : keep-alive HTTP + SO_KEEPALIVE TCP, pool dimensionné
+    pour les threads concurrents (pool WS UI, pré-checks, notifications, sonde)."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+
+    keepalive = _tcp_keepalive_options(
+        int(SCALE_CONFIG.get("tcp_keepidle_s", 60)), int(SCALE_CONFIG.get("tcp_keepintvl_s", 15))
+    )
+
+    class _KeepAliveAdapter(HTTPAdapter):
+        def init_poolmanager(self, *a, **k):
+            k["socket_options"] = HTTPConnection.default_socket_options + keepalive
+            super().init_poolmanager(*a, **k)
+
+    session = requests.Session()
+    session.verify = verify
+    session.headers["Connection"] = "keep-alive"
+    adapter = _KeepAliveAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 # ─────────────────────────────────────────────────────────────────────────────
 # [3] Implémentation WebService
 # ─────────────────────────────────────────────────────────────────────────────
@@ -179,13 +247,14 @@ class _WMWebService:
         self.open_width : int       = int(cfg.get("open_width", 113))
         self.close_width: int       = int(cfg.get("close_width", 0))
         self._method_name: str      = cfg.get("method_name", "General Weighing")
+        self.notify_long_poll_s: int = int(cfg.get("notify_long_poll_s", 60))
 
         self.base = f"{scheme}://{ip}:{port}/MT/Laboratory/Balance/XprXsr/V03/"
 
-        import requests
-        self._session = requests.Session()
-        self._session.verify = self.verify
-        self._transport = Transport(session=self._session, timeout=self.timeout_s)
+        # Une session keep-alive + cache des imports WSDL/XSD pour toute la vie du WM
+        self._session = _keepalive_session(self.verify)
+        self._transport = Transport(session=self._session, timeout=self.timeout_s,
+                                    cache=InMemoryCache())
 
         self._client = Client(
             wsdl, settings=Settings(strict=False, xml_huge_tree=True), transport=self._transport
@@ -202,8 +271,17 @@ class _WMWebService:
         self._svc_wtask   = self._client.create_service(ns + "BasicHttpBinding_IWeighingTaskService", self.base)
 
         self.session_id: Optional[str] = None
+        # WM partagé (pool WS, worker UR3, thread dosing, sonde) : une seule (ré)ouverture à la fois
+        self._session_lock = threading.Lock()
         self._task_ready: bool = False
         self._last_async_cmd_id: Optional[int] = None
+        self._last_ok_mono: float = 0.0  # time.monotonic() du dernier appel SOAP réussi
+        # Notifié (depuis le thread appelant) quand la liaison change d'état
+        self.on_conn_change: Optional[Callable[[bool], None]] = None
+        self._link_up: Optional[bool] = None
+        # Dernières valeurs lues (poids, portes, dosing head) : clé → (monotonic, valeur)
+        self._cache: Dict[str, tuple] = {}
+        self._cache_lock = threading.Lock()
 
     # ─────────────────────────────────────────────────────────────────────────
     # 3.1 Session
@@ -219,13 +297,59 @@ class _WMWebService:
 
     def _ensure_session(self):
         if not self.session_id:
-            self._open_session()
+            with self._session_lock:
+                if not self.session_id:
+                    self._open_session()
+
+    def _renew_session(self, stale: Optional[str]):
+        """Réouvre la session si elle vaut encore 'stale' (sinon un autre thread l'a déjà fait)."""
+        with self._session_lock:
+            if self.session_id == stale:
+                self._open_session()
 
     def connect(self): self._ensure_session()
     def close(self):
         self.session_id = None
         self._task_ready = False
+        with self._cache_lock:
+            self._cache.clear()
     def is_connected(self) -> bool: return bool(self.session_id)
+    def seconds_since_ok(self) -> float:
+        """Secondes écoulées depuis le dernier appel SOAP réussi."""
+        return time.monotonic() - self._last_ok_mono
+    def _cache_get(self, key: str, max_age_ms: float):
+        """Valeur en cache si plus récente que max_age_ms, sinon _MISS."""
+        if max_age_ms <= 0:
+            return _MISS
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        if hit is None or (time.monotonic() - hit[0]) * 1000.0 >= max_age_ms:
+            return _MISS
+        return hit[1]
+    def _cache_put(self, key: str, value):
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), value)
+    def _cache_drop(self, key: str):
+        with self._cache_lock:
+            self._cache.pop(key, None)
+    def _set_link(self, ok: bool):
+        if ok == self._link_up:
+            return
+        self._link_up = ok
+        cb = self.on_conn_change
+        if cb is not None:
+            try:
+                cb(ok)
+            except Exception:
+                pass  # un callback UI ne doit jamais casser l'appel SOAP
+    def cheap_ping(self, timeout_s: float = 1.0) -> bool:
+        """HEAD sur l'endpoint via la session HTTP keep-alive (pas d'enveloppe SOAP).
+        Toute réponse HTTP < 500 (405 inclus) prouve que le serveur répond."""
+        try:
+            resp = self._session.head(self.base, timeout=timeout_s)
+        except Exception:
+            return False
+        return resp.status_code < 500
 
     # ─────────────────────────────────────────────────────────────────────────
     # 3.2 Portes (DraftShields) — politique unique
@@ -265,6 +389,7 @@ class _WMWebService:
                 v = _to_float(w)
                 if v is not None:
                     out[str(did)] = int(v)
+        self._cache_put("doors", out)
         return out
 
     def _verify_door(self, expect_width: int, tol: int = 2, timeout_s: float = 2.0) -> bool:
@@ -329,16 +454,20 @@ class _WMWebService:
     @_with_session_retry
     def zero(self) -> str:
         _ = _soap(self, self._svc_weigh.Zero, SessionId=self.session_id, ZeroImmediately=True)
+        self._cache_drop("weight")
         return "OK"
 
     @_with_session_retry
     def tare(self) -> str:
         _ = _soap(self, self._svc_weigh.Tare, SessionId=self.session_id, TareImmediately=True)
+        self._cache_drop("weight")
         return "OK"
 
     @_with_session_retry
-    def get_weights(self, capture_mode: str = "Stable", timeout_s: int = 5) -> dict:
-        """Retourne {'net_g': float|None, 'gross_g': float|None} en grammes (robuste dict/objet)."""
+    def get_weights(self, capture_mode: str = "Stable", timeout_s: int = 5,
+                    fallback_immediate: bool = True) -> dict:
+        """Retourne {'net_g': float|None, 'gross_g': float|None} en grammes (robuste dict/objet).
+        fallback_immediate=False : pas de relecture Immediate si le mode demandé ne renvoie rien."""
         def _call(mode: str):
             return _soap(
                 self, self._svc_weigh.GetWeight,
@@ -358,7 +487,7 @@ class _WMWebService:
         resp = _call(capture_mode) or {}
         ws = _extract_ws(resp)
 
-        if ws is None:
+        if ws is None and fallback_immediate:
             # fallback Immediate
             resp = _call("Immediate") or {}
             ws = _extract_ws(resp)
@@ -381,51 +510,69 @@ class _WMWebService:
 
         return {"net_g": _to_g(net_v, net_u), "gross_g": _to_g(gro_v, gro_u)}
 
-    def get_weight(self) -> float:
-        """Préfère le net, sinon brut; si rien → 0.0 (pour ne pas casser l'UI)."""
+    def get_weight(self, max_age_ms: float = 0) -> float:
+        """Préfère le net, sinon brut; si rien → 0.0 (pour ne pas casser l'UI).
+        max_age_ms > 0 : sert la dernière lecture si elle est assez récente."""
+        cached = self._cache_get("weight", max_age_ms)
+        if cached is not _MISS:
+            return cached
         w = self.get_weights()
         if w["net_g"] is not None:
-            return w["net_g"]
-        if w["gross_g"] is not None:
-            return w["gross_g"]
-        return 0.0
+            g = w["net_g"]
+        elif w["gross_g"] is not None:
+            g = w["gross_g"]
+        else:
+            g = 0.0
+        self._cache_put("weight", g)
+        return g
     # ─────────────────────────────────────────────────────────────────────────
     # 3.5 Pan sensing : vide / présence
     # ─────────────────────────────────────────────────────────────────────────
-    def _sample_gross(self, n=10, sleep_s=0.05) -> List[float]:
-        vals = []
-        for _ in range(max(3, int(n))):
+    def _sample_gross(self, n=10, sleep_s=0.05, stable_first: bool = True) -> _RunningStats:
+        """Brut du plateau : une lecture Stable (la balance attend elle-même la stabilité),
+        sinon n lectures Immediate espacées de sleep_s (moyenne / σ en flux)."""
+        stats = _RunningStats()
+        if stable_first:
+            try:
+                w = self.get_weights(capture_mode="Stable", timeout_s=1, fallback_immediate=False)
+            except Exception:
+                w = None  # pas stable dans le délai → échantillonnage
+            if w and w["gross_g"] is not None:
+                stats.push(w["gross_g"])
+                return stats
+        n = max(3, int(n))
+        for i in range(n):
             w = self.get_weights(capture_mode="Immediate", timeout_s=1)
             if w["gross_g"] is not None:
-                vals.append(w["gross_g"])
-            time.sleep(sleep_s)
-        return vals
-
-    def is_pan_empty(self, threshold_mg: float = 9.0, samples: int = 10, sleep_s: float = 0.05):
-        vals = self._sample_gross(samples, sleep_s)
-        if not vals:
+                stats.push(w["gross_g"])
+            if sleep_s and i < n - 1:
+                time.sleep(sleep_s)
+        return stats
+
+    def is_pan_empty(self, threshold_mg: float = 9.0, samples: int = 10, sleep_s: float = 0.05,
+                     stable_first: bool = True):
+        st = self._sample_gross(samples, sleep_s, stable_first)
+        if not st.n:
             thr = threshold_mg / 1000.0
             return (False, {"mean_gross_g": 0.0, "std_gross_g": 0.0, "threshold_g": thr, "n": 0})
-        mean = sum(vals)/len(vals)
-        var  = sum((v-mean)**2 for v in vals)/max(1, len(vals)-1)
-        std  = var**0.5
+        std  = st.std
         thr  = max(threshold_mg/1000.0, 5.0*std)
-        return (abs(mean) < thr, {"mean_gross_g": mean, "std_gross_g": std, "threshold_g": thr, "n": len(vals)})
+        return (abs(st.mean) < thr, {"mean_gross_g": st.mean, "std_gross_g": std, "threshold_g": thr, "n": st.n})
 
-    def is_pan_present(self, min_present_mg: float = 1000.0, samples: int = 10, sleep_s: float = 0.05):
-        vals = self._sample_gross(samples, sleep_s)
-        if not vals:
-            thr = float(min_present_mg) / 1000.0
+    def is_pan_present(self, min_present_mg: float = 1000.0, samples: int = 10, sleep_s: float = 0.05,
+                       stable_first: bool = True):
+        st = self._sample_gross(samples, sleep_s, stable_first)
+        thr = float(min_present_mg) / 1000.0
+        if not st.n:
             return (False, {"mean_gross_g": 0.0, "std_gross_g": 0.0, "threshold_g": thr, "n": 0})
-        mean = sum(vals)/len(vals)
-        var  = sum((v-mean)**2 for v in vals)/max(1, len(vals)-1)
-        std  = var**0.5
-        thr  = float(min_present_mg)/1000.0
-        return (mean >= thr, {"mean_gross_g": mean, "std_gross_g": std, "threshold_g": thr, "n": len(vals)})
+        return (st.mean >= thr, {"mean_gross_g": st.mean, "std_gross_g": st.std, "threshold_g": thr, "n": st.n})
 
-    def get_door_positions(self) -> Dict[str, int]:
+    def get_door_positions(self, max_age_ms: float = 0) -> Dict[str, int]:
+        cached = self._cache_get("doors", max_age_ms)
+        if cached is not _MISS:
+            return dict(cached)
         self._ensure_session()
-        return self._draft_positions()
+        return dict(self._draft_positions())
 
     # ─────────────────────────────────────────────────────────────────────────
     # 3.6 Méthodes & Tolerances (WeighingTask) — compact
@@ -544,6 +691,87 @@ class _WMWebService:
             "JobErrors": resp.get("JobErrors"),
         }
     
+    def prepare_and_start_dosing(self,
+                                 vial_name: str,
+                                 substance_name: str,
+                                 target_value: float,
+                                 target_unit: str = "mg",
+                                 lower_tol_value: float | None = None,
+                                 upper_tol_value: float | None = None,
+                                 tol_unit: str | None = None,
+                                 *,
+                                 min_present_mg: float = 1000.0,
+                                 presence_margin_mg: float | None = None,
+                                 presence_samples: int = 8) -> dict:
+        """Pré-checks + StartDosingJob en un seul appel (thread appelant).
+        Fermeture porte puis ReadDosingHead, à la suite ; présence vial sur une
+        lecture Gross Immediate, décisive seulement hors de la bande seuil ± presence_margin_mg
+        (sinon lecture moyennée sur presence_samples) ; 'Dosing' démarrée seulement si
+        la méthode en cache diffère.
+        Retourne {'logs': [(msg, level)], 'ok', 'substance', 'method_set', 'resp'}."""
+        logs = []
+        out = {"logs": logs, "ok": False, "substance": None, "method_set": False, "resp": None}
+
+        # --- A) Porte, puis dispenser ---
+        try:
+            logs.append((f"Close door → {self.close_door()}", "info"))
+        except Exception as e_close:
+            logs.append((f"Impossible de fermer la porte: {e_close}", "error"))
+            return out  # on ne lance pas le job si on ne peut pas fermer
+
+        head_name = (self.read_dosing_head_name() or "").strip()
+        if not head_name:
+            logs.append((
+                "Aucun dispenser détecté (ReadDosingHead vide). "
+                "Place un dosing head puis relance.",
+                "warning",
+            ))
+            return out
+
+        # --- B) Vial présente ? ---
+        thr = float(min_present_mg) / 1000.0
+        if presence_margin_mg is None:
+            presence_margin_mg = float(SCALE_CONFIG.get("vial_presence_margin_mg", 2000.0))
+        margin = float(presence_margin_mg) / 1000.0
+        gross = self.get_weights(capture_mode="Immediate", timeout_s=1)["gross_g"]
+        if gross is not None and abs(gross - thr) > margin:
+            has_vial = gross > thr  # loin du seuil : une lecture bruitée ne peut pas basculer
+        else:
+            # près du seuil (ou lecture absente) : lecture stable / moyennée, comme avant
+            has_vial, stats = self.is_pan_present(min_present_mg=min_present_mg,
+                                                  samples=presence_samples, sleep_s=0.04)
+            gross = stats["mean_gross_g"]
+        if not has_vial:
+            logs.append((
+                "Aucune vial détectée sur le plateau — je ne lance pas le job. "
+                f"(Gross≈{(gross or 0)*1000:.1f} mg, seuil≈{thr*1000:.1f} mg)",
+                "warning",
+            ))
+            return out
+
+        # (facultatif) synchro substance si champ vide
+        if not substance_name:
+            substance_name = out["substance"] = head_name
+
+        # --- C) Méthode 'Dosing' (cache local, pas de StartTask inutile) ---
+        if (self._method_name or "").strip().lower() != "dosing":
+            logs.append(("La méthode active n'est pas 'Dosing' → je la démarre avant le job.", "info"))
+            self.set_method("Dosing")
+            out["method_set"] = True
+
+        # --- D) Envoi ---
+        resp = out["resp"] = self.start_dosing_job(
+            vial_name=vial_name,
+            substance_name=substance_name,
+            target_value=target_value,
+            target_unit=target_unit,
+            lower_tol_value=lower_tol_value,
+            upper_tol_value=upper_tol_value,
+            tol_unit=tol_unit,
+        )
+        out["ok"] = resp.get("Outcome") == "Success" and not resp.get("StartDosingJobListError")
+        return out
+
     @_with_session_retry
     def cancel_dosing_job_list(self) -> dict:
         """Annule la job list en cours (IDosingAutomationService.CancelCurrentDosingJobListAsync)."""
@@ -588,11 +816,19 @@ class _WMWebService:
         }
 
 
+    def read_dosing_head_name(self, max_age_ms: float = 0) -> str:
+        cached = self._cache_get("head", max_age_ms)
+        if cached is not _MISS:
+            return cached
+        return self._read_dosing_head_name()
+
     @_with_session_retry
-    def read_dosing_head_name(self) -> str:
+    def _read_dosing_head_name(self) -> str:
         resp = _soap(self, self._svc_dosing.ReadDosingHead, SessionId=self.session_id) or {}
         substance = ((resp.get("DosingHeadInfo") or {}).get("SubstanceName"))
-        return str(substance or "")
+        name = str(substance or "")
+        self._cache_put("head", name)
+        return name
 
     @_with_session_retry
     def write_dosing_head_name(self, name: str) -> str:
@@ -614,6 +850,7 @@ class _WMWebService:
         outcome = resp.get("Outcome")
         if outcome is not None and str(outcome) != "Success":
             raise RuntimeError(f"WriteDosingHead Outcome={outcome}")
+        self._cache_put("head", str(name))
         return "OK"
 
     @_with_session_retry
@@ -638,9 +875,66 @@ class _WMWebService:
             return []
         return inner if isinstance(inner, list) else [inner]
 
+    def _poll_notifications(self, long_poll_s: int, log) -> Optional[List[dict]]:
+        """Un GetNotifications (long polling). [] si session réouverte (à rappeler),
+        None si erreur fatale (sortie de la boucle)."""
+        sid = self.session_id
+        try:
+            resp = _soap(self, self._svc_notify.GetNotifications,
+                         SessionId=sid,
+                         LongPollingTimeout=long_poll_s) or {}
+        except Exception as e:
+            log(f"ERREUR GetNotifications: {e}", True)
+            if "Session" in str(e):
+                log("→ tentative de réouverture de session", True)
+                self._renew_session(sid)
+                return []
+            return None
+        return self._notif_list(resp)
+
+    def _handle_notification(self, n, log) -> bool:
+        """Traite une notification (confirme les actions) ; True = fin de la job list."""
+        if not isinstance(n, dict):
+            return False
+
+        # 1) Action à confirmer
+        if "DosingAutomationActionAsyncNotification" in n:
+            notif = n.get("DosingAutomationActionAsyncNotification") or {}
+            action = (notif.get("DosingJobActionType")
+                      or notif.get("RequestedDosingJobAction")
+                      or notif.get("ExecutedDosingJobAction"))
+            item = notif.get("ActionItem")
+            log(f"Dosing action: {action} / {item}", True)
+            if action:
+                self.confirm_dosing_action(str(action), item)
+            return False
+
+        # 2) Job terminé
+        if "DosingAutomationJobFinishedAsyncNotification" in n:
+            jn = n.get("DosingAutomationJobFinishedAsyncNotification") or {}
+            dres = jn.get("DosingResult", {})
+            job  = dres.get("DosingJob", {})
+            ws   = dres.get("WeightSample", {})
+
+            t_v, t_u  = _read_vu(job.get("TargetWeight"))
+            n_v, n_u  = _read_vu(ws.get("NetWeight"))
+            lo_v, lo_u = _read_vu(job.get("LowerTolerance"))
+            up_v, up_u = _read_vu(job.get("UpperTolerance"))
+
+            log(f"Job fini: Outcome={jn.get('Outcome')} "
+                f"Target={t_v} {t_u} Net={n_v} {n_u} "
+                f"Tol=-{lo_v} {lo_u}/+{up_v} {up_u}", True)
+            return False
+
+        # 3) Fin de la job list
+        if "DosingAutomationFinishedAsyncNotification" in n:
+            log("Fin DosingAutomation", True)
+            return True
+        return False
+
     def auto_confirm_dosing_notifications(self,
                                           log_cb: Callable[[str], None] | None = None,
-                                          long_poll_s: int = 10,
+                                          long_poll_s: int | None = None,
                                           verbose: bool = False,
                                           stop_event: Optional[threading.Event] = None) -> None:
         def log(msg: str, force: bool = False):
@@ -648,61 +942,20 @@ class _WMWebService:
                 log_cb(msg)
 
         log("Démarrage auto_confirm_dosing_notifications()", True)
+        # Long polling : la balance garde la requête ouverte jusqu'à une notification
+        # (ou long_poll_s) ; stop_event n'est vérifié qu'entre deux appels
+        long_poll_s = int(long_poll_s or self.notify_long_poll_s)
 
         while True:
             if stop_event is not None and stop_event.is_set():
                 log("Stop demandé → sortie du polling de notifications.", True)
                 return
-            try:
-                resp = _soap(self, self._svc_notify.GetNotifications,
-                             SessionId=self.session_id,
-                             LongPollingTimeout=int(long_poll_s)) or {}
-            except Exception as e:
-                log(f"ERREUR GetNotifications: {e}", True)
-                if "Session" in str(e):
-                    log("→ tentative de réouverture de session", True)
-                    self._open_session()
-                    continue
+            notifs = self._poll_notifications(long_poll_s, log)
+            if notifs is None:
                 return
-
-            for n in self._notif_list(resp):
-                if not isinstance(n, dict):
-                    continue
-
-                # 1) Action à confirmer
-                if "DosingAutomationActionAsyncNotification" in n:
-                    notif = n.get("DosingAutomationActionAsyncNotification") or {}
-                    action = (notif.get("DosingJobActionType")
-                              or notif.get("RequestedDosingJobAction")
-                              or notif.get("ExecutedDosingJobAction"))
-                    item = notif.get("ActionItem")
-                    log(f"Dosing action: {action} / {item}", True)
-                    if action:
-                        self.confirm_dosing_action(str(action), item)
-                    continue
-
-                # 2) Job terminé
-                if "DosingAutomationJobFinishedAsyncNotification" in n:
-                    jn = n.get("DosingAutomationJobFinishedAsyncNotification") or {}
-                    dres = jn.get("DosingResult", {})
-                    job  = dres.get("DosingJob", {})
-                    ws   = dres.get("WeightSample", {})
-
-                    t_v, t_u  = _read_vu(job.get("TargetWeight"))
-                    n_v, n_u  = _read_vu(ws.get("NetWeight"))
-                    lo_v, lo_u = _read_vu(job.get("LowerTolerance"))
-                    up_v, up_u = _read_vu(job.get("UpperTolerance"))
-
-                    log(f"Job fini: Outcome={jn.get('Outcome')} "
-                        f"Target={t_v} {t_u} Net={n_v} {n_u} "
-                        f"Tol=-{lo_v} {lo_u}/+{up_v} {up_u}", True)
-                    continue
-
-                # 3) Fin de la job list
-                if "DosingAutomationFinishedAsyncNotification" in n:
-                    log("Fin DosingAutomation", True)
+            for n in notifs:
+                if self._handle_notification(n, log):
                     return
-            # sinon boucle
 
 # ─────────────────────────────────────────────────────────────────────────────
 # [4] Façade WM — API publique pour WinBalance
@@ -717,17 +970,26 @@ class WM:
     def connect(self): return self._impl.connect()
     def close(self):   return self._impl.close()
     def is_connected(self): return self._impl.is_connected()
+    def seconds_since_ok(self) -> float: return self._impl.seconds_since_ok()
+    def cheap_ping(self, timeout_s: float = 1.0) -> bool: return self._impl.cheap_ping(timeout_s)
+
+    @property
+    def on_conn_change(self) -> Optional[Callable[[bool], None]]:
+        return self._impl.on_conn_change
+    @on_conn_change.setter
+    def on_conn_change(self, cb: Optional[Callable[[bool], None]]):
+        self._impl.on_conn_change = cb
 
     # Portes
     def open_door(self):    return self._impl.open_door()
     def close_door(self):   return self._impl.close_door()
     def wakeup_from_standby(self): return self._impl.wakeup_from_standby()
-    def get_door_positions(self) -> Dict[str, int]: return self._impl.get_door_positions()
+    def get_door_positions(self, max_age_ms: float = 0) -> Dict[str, int]: return self._impl.get_door_positions(max_age_ms)
 
     # Pesée
     def zero(self):       return self._impl.zero()
     def tare(self):       return self._impl.tare()
-    def get_weight(self): return self._impl.get_weight()
+    def get_weight(self, max_age_ms: float = 0): return self._impl.get_weight(max_age_ms)
     def get_weights(self, *a, **k): return self._impl.get_weights(*a, **k)
 
     # Pan sensing
@@ -742,6 +1004,7 @@ class WM:
 
     # Dosing
     def start_dosing_job(self, *a, **k):      return self._impl.start_dosing_job(*a, **k)
+    def prepare_and_start_dosing(self, *a, **k): return self._impl.prepare_and_start_dosing(*a, **k)
     def confirm_dosing_action(self, *a, **k): return self._impl.confirm_dosing_action(*a, **k)
     def auto_confirm_dosing_notifications(self, *a, **k): return self._impl.auto_confirm_dosing_notifications(*a, **k)
     def cancel_dosing_job_list(self, *a, **k): return self._impl.cancel_dosing_job_list(*a, **k)
@@ -749,5 +1012,5 @@ class WM:
     def cancel_command(self, *a, **k):         return self._impl.cancel_command(*a, **k)
 
     # Dosing head
-    def get_dosing_head_name(self) -> str:                return self._impl.read_dosing_head_name()
+    def get_dosing_head_name(self, max_age_ms: float = 0) -> str: return self._impl.read_dosing_head_name(max_age_ms)
     def set_dosing_head_name(self, name: str) -> str:     return self._impl.write_dosing_head_name(name)
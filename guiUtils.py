@@ -46,6 +46,14 @@ class GUIFactory:
         entry.grid(row=row, column=column, padx=padx, pady=pady, sticky=sticky)
         return entry
 
+    def create_combo(self, textvariable, values, row, column, width=10,
+                     state="readonly", padx=5, pady=5, sticky="", columnspan=1, **kwargs):
+        """Combobox (readonly par défaut), sans export de la sélection vers X."""
+        combo = ttk.Combobox(self.parent, textvariable=textvariable, values=values,
+                             width=width, state=state, exportselection=False, **kwargs)
+        combo.grid(row=row, column=column, padx=padx, pady=pady, sticky=sticky, columnspan=columnspan)
+        return combo
+
 class ToolTip:
     """
     Classe pour créer une info-bulle (tooltip) pour un widget donné.
@@ -77,9 +85,14 @@ class ToolTip:
             self.widget.after_cancel(self.id)
             self.id = None
     
-    def showtip(self, event=None):
+    def _tip_xy(self):
+        """Position écran de l'info-bulle : sous le widget survolé."""
         x = self.widget.winfo_rootx() + self.x_offset
         y = self.widget.winfo_rooty() + self.widget.winfo_height() + self.y_offset
+        return x, y
+
+    def showtip(self, event=None):
+        x, y = self._tip_xy()
         # Création d'une fenêtre Toplevel
         self.tipwindow = tw = tk.Toplevel(self.widget)
         tw.wm_overrideredirect(True)  # Supprime les bordures de la fenêtre
@@ -95,3 +108,69 @@ class ToolTip:
         if self.tipwindow:
             self.tipwindow.destroy()
             self.tipwindow = None
+
+
+class SharedToolTip(ToolTip):
+    """
+    Une seule info-bulle partagée par plusieurs widgets : un bindtag commun
+    (<Enter>/<Leave> liés une fois via bind_class), texte choisi par widget survolé.
+    """
+    def __init__(self, master):
+        self.widget = master
+        self.text = ""
+        self.tipwindow = None
+        self.id = None
+        self.delay = 500
+        self.x_offset = 20
+        self.y_offset = 10
+        self._texts: dict[str, str] = {}
+        self._tag = f"SharedToolTip{id(self)}"
+        master.bind_class(self._tag, "<Enter>", self._on_enter)
+        master.bind_class(self._tag, "<Leave>", self.leave)
+
+    def add(self, widget, text):
+        """Associe un texte au widget et lui ajoute le bindtag partagé."""
+        self._texts[str(widget)] = text
+        widget.bindtags((self._tag,) + widget.bindtags())
+
+    def _on_enter(self, event):
+        self.hidetip()
+        self.widget = event.widget
+        self.text = self._texts.get(str(event.widget), "")
+        self.schedule()
+
+
+class CanvasToolTip(ToolTip):
+    """
+    Info-bulle pour les items d'un Canvas : <Enter>/<Leave> liés une fois sur un tag
+    (tag_bind), texte choisi par item survolé, affichée sous l'item.
+    """
+    def __init__(self, canvas, tag):
+        self.widget = canvas
+        self.text = ""
+        self.tipwindow = None
+        self.id = None
+        self.delay = 500
+        self.x_offset = 20
+        self.y_offset = 10
+        self._texts: dict[int, str] = {}
+        self._item = None
+        canvas.tag_bind(tag, "<Enter>", self._on_enter)
+        canvas.tag_bind(tag, "<Leave>", self.leave)
+
+    def add(self, item, text):
+        """Associe un texte à l'item (id renvoyé par create_*)."""
+        self._texts[item] = text
+
+    def _on_enter(self, event):
+        self.hidetip()
+        hit = self.widget.find_withtag("current")
+        self._item = hit[0] if hit else None
+        self.text = self._texts.get(self._item, "")
+        self.schedule()
+
+    def _tip_xy(self):
+        x0, _y0, _x1, y1 = self.widget.bbox(self._item)
+        x = self.widget.winfo_rootx() + x0 + self.x_offset
+        y = self.widget.winfo_rooty() + y1 + self.y_offset
+        return x, y
@@ -113,7 +113,7 @@ class WinAuto(tk.Frame):
         # On utilise EXACTEMENT la même logique que le bouton "Connect"
         try:
             # C'est cette méthode qui fait : _make_ur3() + arm.connect() + devices['ur3'] = arm + refresh
-            self.win_robot.on_connect()
+            self.win_robot.on_connect(blocking=True)
         except Exception as e:
             self._log(f"Mode Auto: erreur en appelant win_robot.on_connect(): {e}", level="error")
             return False
@@ -153,7 +153,7 @@ class WinAuto(tk.Frame):
 
         try:
             # WinBalance.on_connect() crée WM(), fait connect(), et met devices['scale'] = wm
-            self.win_balance.on_connect()
+            self.win_balance.on_connect(blocking=True)
         except Exception as e:
             self._log(f"Mode Auto: erreur en appelant win_balance.on_connect(): {e}", level="error")
             return False
@@ -520,7 +520,7 @@ class WinAuto(tk.Frame):
 
         # Lance exactement la même logique que le bouton manuel
         try:
-            self.win_balance.on_start_dosing_job()
+            self.win_balance.on_start_dosing_job(blocking=True)
         except Exception as e:
             self._abort_sequence(f"erreur lancement dosing job: {e}")
             return
@@ -529,12 +529,11 @@ class WinAuto(tk.Frame):
         self.after(300, self._check_dosing_started)
 
     def _check_dosing_started(self):
-        """Vérifie que le thread de notifications dosing a réellement démarré."""
+        """Vérifie que le suivi des notifications dosing a réellement démarré."""
         if not self._seq_running:
             return
-        t = getattr(self.win_balance, "_dosing_thread", None)
-        if t is None or not t.is_alive():
-            # Pas de thread → le job ne s'est probablement pas lancé
+        if not self.win_balance.is_dosing_running():
+            # Pas de suivi actif → le job ne s'est probablement pas lancé
             self._abort_sequence(
                 "dosing job non démarré (vérifie la présence de la vial et du dosing head)."
             )
@@ -544,24 +543,18 @@ class WinAuto(tk.Frame):
         self._wait_dosing_finished()
 
     def _wait_dosing_finished(self):
-        """Poll sur l'état du thread _dosing_thread jusqu'à sa fin."""
+        """Poll sur WinBalance.is_dosing_running() jusqu'à la fin du suivi."""
         if not self._seq_running:
             return
 
-        t = getattr(self.win_balance, "_dosing_thread", None)
-        if t is None:
-            # plus de thread → on considère que c'est fini
-            self._on_dosing_done()
-            return
-
-        if t.is_alive():
+        if self.win_balance.is_dosing_running():
             # Toujours en cours → replanifier un check
             self._seq_after_id = self.after(1000, self._wait_dosing_finished)
         else:
             self._on_dosing_done()
 
     def _on_dosing_done(self):
-        """Appelé quand le thread de notifications dosing est terminé (job terminé)."""
+        """Appelé quand le suivi des notifications dosing est terminé (job terminé)."""
         self._log("Mode Auto: dosing job terminé (Fin DosingAutomation détecté).", level="info")
 
         # Petite marge de sécurité avant d'ouvrir la porte / lancer P3
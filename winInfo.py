@@ -71,13 +71,36 @@ class WinInfo(tk.LabelFrame):
         self.text.grid(row = 0, column = 0, pady = 5, padx = 5, sticky=tk.EW)
         self.text.focus()           # Placing cursor in the text area
 
+    @property
+    def debug_enabled(self) -> bool:
+        """True si le logger émet les messages de niveau DEBUG."""
+        return logger.isEnabledFor(logging.DEBUG)
+
     def add(self, message, level="info"):
         """Add a message to the text widget and log it to a file."""
         timestamp = dt.datetime.now().strftime("%d %B %Y -- %H:%M:%S: ")
         formatted_message = f"{timestamp}{message}\n"
 
         self.append_message_to_widget(formatted_message)
+        self._log(message, level)
+
+    def add_many(self, messages, level="info"):
+        """Add several messages with a single Text insert (one reflow instead of N)."""
+        if not messages:
+            return
+        timestamp = dt.datetime.now().strftime("%d %B %Y -- %H:%M:%S: ")
+        # Insertion en '1.0' : ordre inversé pour garder le dernier message en haut, comme add()
+        chunks = []
+        for message in reversed(messages):
+            chunks += [timestamp, 'time', f"{message}\n", ()]
+        self.text.configure(state='normal')
+        self.text.insert('1.0', *chunks)
+        self.text.tag_config('time', foreground='green')
+        self.text.configure(state='disabled')
+        for message in messages:
+            self._log(message, level)
 
+    def _log(self, message, level):
         # Log the message depending on wich level
         if level == "info":
             logger.info(message)
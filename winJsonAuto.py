@@ -193,7 +193,7 @@ class WinJsonAuto(tk.Frame):
 
         self._log("JSON mode: trying to auto-connect UR3…", level="info")
         try:
-            self.robot_win.on_connect()
+            self.robot_win.on_connect(blocking=True)
         except Exception as e:
             self._log(f"JSON mode: on_connect() UR3 failed: {e}", level="error")
             return False
@@ -217,7 +217,7 @@ class WinJsonAuto(tk.Frame):
 
         self._log("JSON mode: trying to auto-connect balance…", level="info")
         try:
-            self.balance_win.on_connect()
+            self.balance_win.on_connect(blocking=True)
         except Exception as e:
             self._log(f"JSON mode: on_connect() balance failed: {e}", level="error")
             return False
@@ -486,7 +486,7 @@ class WinJsonAuto(tk.Frame):
 
         try:
             # 1) refresh UR programs and select short_name in the combo, like in manual mode
-            self.robot_win.on_refresh_programs()
+            self.robot_win.on_refresh_programs(blocking=True)
             values = list(self.robot_win.cmb_programs["values"] or [])
             if not values:
                 raise RuntimeError("no .urp program available on the robot.")
@@ -508,7 +508,7 @@ class WinJsonAuto(tk.Frame):
                 raise RuntimeError(f"program {short_name!r} not found on the robot.")
 
             self.robot_win.var_selected_program.set(target)
-            self.robot_win.on_load_selected_program()
+            self.robot_win.on_load_selected_program(blocking=True)
             self._log(f"JSON mode: loading program {short_name} ({phase_label}).")
         except Exception as e:
             self._abort(f"Unable to load program {short_name}: {e}")
@@ -627,7 +627,7 @@ class WinJsonAuto(tk.Frame):
 
         # Trigger the same logic as the manual "Start dosing job" button
         try:
-            self.balance_win.on_start_dosing_job()
+            self.balance_win.on_start_dosing_job(blocking=True)
         except Exception as e:
             self._abort(f"Error when starting dosing job: {e}")
             return
@@ -645,23 +645,12 @@ class WinJsonAuto(tk.Frame):
             self._abort("Unexpected internal state (_waiting_for != 'dosing').")
             return
 
-        t = getattr(self.balance_win, "_dosing_thread", None)
-        if t is None:
-            # no thread → job considered finished
-            self._log("JSON mode: dosing job finished (thread missing).", level="info")
-            cb = getattr(self, "_on_done_dosing", None)
-            self._on_done_dosing = None
-            self._waiting_for = None
-            if callable(cb):
-                cb()
-            return
-
-        if t.is_alive():
+        if self.balance_win.is_dosing_running():
             # still running → re-schedule check
             self._after_id = self.after(1000, self._poll_dosing_state)
             return
 
-        # thread finished
+        # notification follow-up finished
         self._log("JSON mode: dosing job finished.", level="info")
         cb = getattr(self, "_on_done_dosing", None)
         self._on_done_dosing = None
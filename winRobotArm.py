@@ -5,7 +5,14 @@
 
 import tkinter as tk
 import tkinter.ttk as ttk
+import operator
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import partial
+from types import MappingProxyType
 
 from config import UR3_CONFIG, STORAGE_CONFIG, SCALE_CONFIG
 from guiUtils import GUIFactory, ToolTip
@@ -16,15 +23,44 @@ from winStorage import WinStorage
 # ---------------------------------------------------------------------------
 # Constantes / Config
 # ---------------------------------------------------------------------------
-WATCH_PERIOD_MS = 3000  # check connexion toutes les 3 s
+WATCH_PERIOD_MS = 3000  # check connexion toutes les 3 s (période de base)
+WATCH_RUNNING_MS = 1000  # programme en cours : détection de coupure plus rapide
+WATCH_MAX_MS = 10000  # plafond du back-off quand rien ne change
 RUN_POLL_MS = 700  # périodicité du sondage quand le programme tourne (~0.7 s)
-VIAL_ID_TO_NUMBER = UR3_CONFIG.get("vial_id_to_number", {})
+PING_SKIP_S = 1.0  # pas de ping si le Dashboard a répondu il y a moins d'1 s
+WATCH_FULL_PING_EVERY = 10  # heartbeat : vrai ping Dashboard 1 tick sur 10, sinon simple test TCP
+MODES_BATCH = ("robotmode", "safetymode", "get loaded program", "programState")
+# Mappings figés en int à l'import : pas de int() par clic, config invalide → erreur au démarrage
+VIAL_ID_TO_NUMBER = MappingProxyType({k: int(v) for k, v in (UR3_CONFIG.get("vial_id_to_number") or {}).items()})
+_STORAGE_ID_TO_NUMBER = MappingProxyType({k: int(v) for k, v in (STORAGE_CONFIG.get("id_to_number") or {}).items()})
+_S_RE = re.compile(r"^S(\d+)$", re.I)  # repli "S<n>" pour les storages hors mapping
 RTDE_INPUT_REGISTER = int(UR3_CONFIG.get("rtde_input_register", 20))
 DISP_RTDE_INPUT_REGISTER = int(UR3_CONFIG.get("disp_rtde_input_register", 21))
 
+def _safe_pos_int(v) -> int:
+    """Position de porte → int (0 si illisible) ; int/float traités sans passer par str()."""
+    if isinstance(v, int):
+        return v
+    try:
+        if isinstance(v, float):
+            return int(v)
+        s = str(v)
+        return int(s) if s.isdigit() else int(float(s))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
 class WinRobotArm(tk.LabelFrame):
     """Pilote UR3 (connexion, états, play/pause/stop) avec autoload .urp via combobox."""
 
+    # Commandes Dashboard simples : appelables pré-construits (pas de lambda par clic)
+    _MC_POWER_ON = operator.methodcaller("power_on")
+    _MC_POWER_OFF = operator.methodcaller("power_off")
+    _MC_BRAKE_RELEASE = operator.methodcaller("brake_release")
+    _MC_STOP = operator.methodcaller("stop")
+    _MC_PLAY = operator.methodcaller("play")
+    _MC_PAUSE = operator.methodcaller("pause")
+    _MC_PROGRAM_STATE = operator.methodcaller("get_program_state")
+
     # -----------------------------------------------------------------------
     # Construction / State
     # -----------------------------------------------------------------------
@@ -46,6 +82,18 @@ class WinRobotArm(tk.LabelFrame):
         self.var_safety_mode = tk.StringVar(value="-")
         self.var_program = tk.StringVar(value="-")      # ligne dashboard ("Loaded program: ...")
         self.var_prog_state = tk.StringVar(value="-")   # RUNNING/STOPPED/PAUSED côté robot
+        # Miroir Python des variables affichées : écriture Tcl seulement si la valeur change
+        self._var_mirror: dict[str, str] = {}
+        for var in (self.var_status, self.var_robot_mode, self.var_safety_mode,
+                    self.var_program, self.var_prog_state):
+            self._var_mirror[str(var)] = var.get()
+            var.trace_add("write", self._on_mirrored_var_write)
+        # Mémo 1 place de _extract_loaded_path (même ligne Dashboard d'un poll à l'autre)
+        self._last_prog_raw: str | None = None
+        self._last_prog_parsed = ""
+        # Chemin .urp chargé, re-parsé seulement quand var_program change
+        self._loaded_path_cache = self._extract_loaded_path(self.var_program.get())
+        self.var_program.trace_add("write", self._on_program_var_write)
 
         # Programmes (.urp)
         self.var_selected_program = tk.StringVar(value="")
@@ -58,13 +106,27 @@ class WinRobotArm(tk.LabelFrame):
         self.btn_play: tk.Button | None = None
         self._suspend_combo_event = 0   # bloqueur d’évènement
         self._run_watch_id = None  # id du timer de sondage "fin de programme"
+        self._run_watch_active = False  # sondage en cours (timer armé ou requête au worker)
+        self._after_ids: set[str] = set()  # timers after() en attente (annulés au disconnect / destroy)
+        self._watch_id = None  # id du timer heartbeat
+        self._ui_connected_state: bool | None = None  # dernier état appliqué par _set_connected_ui
+        self._watch_interval = WATCH_PERIOD_MS  # période courante du heartbeat (adaptative)
+        self._watch_tick = 0  # compteur de ticks (vrai ping tous les WATCH_FULL_PING_EVERY)
+        self._storage_label_index: dict | None = None  # cache label normalisé → (sid, numéro)
+        self._storage_label_cfg_id = None  # identité de la config indexée
 
         # Sous-fenêtres
         self.win_vials: WinVials | None = None
         self.win_storage: WinStorage | None = None
 
+        # Worker Dashboard : une seule thread, commandes sérialisées (session unique côté UR3)
+        self._dash_q: queue.Queue = queue.Queue()
+        self._dash_thread = threading.Thread(target=self._dash_loop, name="ur3-dashboard", daemon=True)
+        self._dash_thread.start()
+        # Pool balance (porte / plateau / dosing head) : une pesée ne retient jamais la file Dashboard
+        self._scale_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ur3-scale")
+
         self._build()
-        self.after(WATCH_PERIOD_MS, self._watch_period)
 
     # -----------------------------------------------------------------------
     # Context manager : bloqueur évènements combo
@@ -80,6 +142,21 @@ class WinRobotArm(tk.LabelFrame):
     def _combo_events_enabled(self) -> bool:
         return self._suspend_combo_event == 0
 
+    # -----------------------------------------------------------------------
+    # Variables Tk affichées : miroir Python
+    # -----------------------------------------------------------------------
+    def _on_mirrored_var_write(self, name, *_):
+        # aussi déclenché par les écritures externes (ex. winAuto → var_prog_state)
+        self._var_mirror[name] = str(self.tk.globalgetvar(name))
+
+    def _set_var(self, var: tk.StringVar, value: str):
+        """N'écrit côté Tcl que si la valeur change (pas de redraw inutile)."""
+        if self._var_mirror.get(str(var)) != value:
+            var.set(value)
+
+    def _var_value(self, var: tk.StringVar) -> str:
+        return self._var_mirror[str(var)]
+
     # -----------------------------------------------------------------------
     # Helpers matériels / mapping
     # -----------------------------------------------------------------------
@@ -102,24 +179,24 @@ class WinRobotArm(tk.LabelFrame):
 
     def _vial_id_to_number(self, vial_id: str) -> int:
         try:
-            return int(VIAL_ID_TO_NUMBER[vial_id])
+            return VIAL_ID_TO_NUMBER[vial_id]
         except KeyError:
             raise ValueError(f"vial_id inconnu ou non mappé: {vial_id!r}")
 
     def _storage_id_to_number(self, storage_id: str) -> int:
-        m = (STORAGE_CONFIG.get("id_to_number") or {})
-        if storage_id in m:
-            return int(m[storage_id])
-        if isinstance(storage_id, str) and storage_id.upper().startswith("S"):
-            return int(storage_id[1:])
+        num = _STORAGE_ID_TO_NUMBER.get(storage_id)
+        if num is not None:
+            return num
+        m = _S_RE.match(storage_id) if isinstance(storage_id, str) else None
+        if m:
+            return int(m.group(1))
         raise ValueError(f"storage_id invalide: {storage_id!r}")
 
     # -----------------------------------------------------------------------
     # UI build / wiring
     # -----------------------------------------------------------------------
     def _build(self):
-        for c in range(12):
-            self.columnconfigure(c, weight=0, minsize=80)
+        self.columnconfigure(tuple(range(12)), weight=0, minsize=80)
 
         # Ligne 0: Connexion + actions système
         self.btn_connect = self.factory.create_btn("Connect", self.on_connect, 0, 0, width=12, sticky=tk.EW)
@@ -174,6 +251,13 @@ class WinRobotArm(tk.LabelFrame):
         self.win_storage = WinStorage(self, self.info, title="Storage")
         self.win_storage.grid(row=5, column=4, columnspan=3, sticky="ns", padx=5, pady=5)
 
+        # Groupes de boutons basculés ensemble par _set_connected_ui (chemins Tk)
+        self._ui_generic_paths = tuple(str(w) for w in (
+            self.btn_refresh_modes, self.btn_disconnect,
+            self.btn_power_on, self.btn_power_off, self.btn_brake_rel,
+        ))
+        self._ui_run_paths = tuple(str(w) for w in (self.btn_play, self.btn_pause, self.btn_stop))
+
         self._bind_shortcuts()
         self._set_connected_ui(False, initialize=True)
 
@@ -188,6 +272,7 @@ class WinRobotArm(tk.LabelFrame):
     # Connexion / Heartbeat
     # -----------------------------------------------------------------------
     def _set_connected_ui(self, connected: bool, *, initialize: bool = False):
+        self._ui_connected_state = connected
         if connected:
             self.btn_connect.configure(state="disabled", text="Connected")
             self.btn_disconnect.configure(state="normal")
@@ -195,17 +280,13 @@ class WinRobotArm(tk.LabelFrame):
             self.btn_connect.configure(state="normal", text="Connect")
             self.btn_disconnect.configure(state="disabled")
 
-        generic_targets = [
-            self.btn_refresh_modes, self.btn_disconnect,
-            self.btn_power_on, self.btn_power_off, self.btn_brake_rel,
-        ]
-        if initialize:
-            generic_targets += [self.btn_play, self.btn_pause, self.btn_stop]
-
+        paths = self._ui_generic_paths + (self._ui_run_paths if initialize else ())
         state = "normal" if connected else "disabled"
-        for w in generic_targets:
-            try: w.configure(state=state)
-            except Exception: pass
+        try:
+            # un seul aller-retour Tcl pour tout le groupe de boutons
+            self.tk.call("foreach", "w", paths, f"$w configure -state {state}")
+        except tk.TclError:
+            pass
 
         try:
             self.cmb_programs.configure(state="readonly" if connected else "disabled")
@@ -235,33 +316,40 @@ class WinRobotArm(tk.LabelFrame):
             self.btn_pause.configure(text="Continue", state="normal")
             self.btn_stop.configure(state="normal")
 
-    def on_connect(self):
+    def on_connect(self, *, blocking: bool = False):
         if self.btn_connect:
             self.btn_connect.configure(state="disabled", text="Connecting…")
         if getattr(self, "btn_disconnect", None):
             self.btn_disconnect.configure(state="normal")
         try:
-            arm = self._make_ur3()
-            banner = arm.connect()
-            self.devices["ur3"] = arm
-            self._set_connected_ui(True, initialize=True)
-            self.var_status.set("Connected")
-            self.info.add(f"UR3 connecté. Dashboard: {banner or '—'}")
-            if self.btn_connect:
-                self.btn_connect.configure(state="disabled", text="Connected")
-
-            def _post_connect_bootstrap():
-                try: self.on_refresh_modes()
-                except Exception as e: self.info.add(f"Auto-Refresh modes après connexion → ERREUR : {e}", level="error")
-                try: self.on_refresh_programs()
-                except Exception as e: self.info.add(f"Auto-Refresh list après connexion → ERREUR : {e}", level="error")
-            self.after(150, _post_connect_bootstrap)
+            arm = self._make_ur3()  # lit les StringVar : reste sur le thread Tk
+        except ValueError as e:
+            self._on_connected(None, None, e)
+            return
+        # connect() (TCP + bannière) part sur le worker ; blocking=True pour les modes Auto/JSON
+        self._submit_dash(arm.connect, partial(self._on_connected, arm), blocking=blocking)
 
-        except Exception as e:
+    def _on_connected(self, arm, banner, err):
+        if err is not None:
             if self.btn_connect:
                 self.btn_connect.configure(state="normal", text="Connect")
-            self.var_status.set("Error")
-            self.info.add(f"Erreur connexion UR3: {e}", level="error")
+            self._set_var(self.var_status, "Error")
+            self.info.add(f"Erreur connexion UR3: {err}", level="error")
+            return
+        self.devices["ur3"] = arm
+        self._set_connected_ui(True, initialize=True)
+        self._set_var(self.var_status, "Connected")
+        self.info.add(f"UR3 connecté. Dashboard: {banner or '—'}")
+        if self.btn_connect:
+            self.btn_connect.configure(state="disabled", text="Connected")
+        self._start_watch()
+        # simple "laisser Tk finir le rafraîchissement" : pas de délai fixe nécessaire
+        self.after_idle(self._post_connect_bootstrap)
+
+    def _post_connect_bootstrap(self):
+        # Les deux relectures passent par le worker : erreurs rapportées dans leurs callbacks
+        self.on_refresh_modes()
+        self.on_refresh_programs()
 
     def _force_need_reconnect(self, reason: str = ""):
         try:
@@ -270,7 +358,7 @@ class WinRobotArm(tk.LabelFrame):
         except Exception:
             pass
         self.devices["ur3"] = None
-        self.var_status.set("Need Reconnect")
+        self._set_var(self.var_status, "Need Reconnect")
         self._set_connected_ui(False, initialize=True)
         self.btn_connect.configure(text="Reconnect")
         self.info.add("UR3: mode Local/Teach détecté → reconnectez en Remote (Dashboard 29999)." + (f" Détail: {reason}" if reason else ""), level="warning")
@@ -282,31 +370,66 @@ class WinRobotArm(tk.LabelFrame):
         finally:
             self.devices["ur3"] = None
         self._stop_run_watch()
-        self.var_status.set("Disconnected")
+        self._cancel_scheduled()  # heartbeat + refresh en attente : plus rien ne tourne à vide
+        self._set_var(self.var_status, "Disconnected")
         self.btn_connect.configure(state="normal", text="Connect")
         self.btn_disconnect.configure(state="disabled")
         self.info.add("UR3: déconnecté proprement.")
         self._set_connected_ui(False, initialize=True)
 
+    @staticmethod
+    def _probe_link(arm, full_ping: bool) -> bool:
+        # Une réponse Dashboard récente prouve déjà la liaison → pas de ping ;
+        # sinon test TCP sans trafic, et vrai ping seulement de temps en temps
+        if not arm.is_connected():
+            return False
+        if arm.seconds_since_reply() < PING_SKIP_S:
+            return True
+        if not full_ping:
+            return arm.is_socket_alive()
+        return arm.ping()
+
+    def _start_watch(self):
+        """(Re)lance le heartbeat depuis la période de base ; il ne tourne que connecté."""
+        self._cancel_after(self._watch_id)
+        self._watch_interval = WATCH_PERIOD_MS
+        self._watch_id = self._schedule(WATCH_PERIOD_MS, self._watch_period)
+
     def _watch_period(self):
-        try:
-            arm = self.devices.get("ur3")
-            ok = bool(arm and arm.is_connected() and arm.ping())
-        except Exception:
-            ok = False
+        self._watch_id = None
+        arm = self.devices.get("ur3")
+        if arm is None:
+            return  # déjà coupé ailleurs (Need Reconnect, …) : l'UI est à jour
+        self._watch_tick += 1
+        full_ping = self._watch_tick % WATCH_FULL_PING_EVERY == 0
+        self._submit_dash(partial(self._probe_link, arm, full_ping), partial(self._on_watch_result, arm))
+
+    def _on_watch_result(self, arm, ok, err):
+        if self.devices.get("ur3") is not arm:
+            return  # bras fermé / remplacé pendant la sonde : ce résultat ne le concerne plus
+        if bool(ok) and err is None:
+            if self._ui_connected_state is not True:  # heartbeat stable : aucun configure
+                self._set_connected_ui(True, initialize=False)
+            self._set_var(self.var_status, "Connected")
+            self._watch_id = self._schedule(self._next_watch_ms(), self._watch_period)
+            return
+        # Liaison perdue : le heartbeat s'arrête, il repartira à la prochaine connexion
+        self._set_connected_ui(False, initialize=True)
+        self.info.add("UR3: connexion perdue.", level="warning")
+        try: arm.close()
+        except Exception: pass
+        self.devices["ur3"] = None
+        self._set_var(self.var_status, "Disconnected")
 
-        if ok:
-            self._set_connected_ui(True, initialize=False)
-            self.var_status.set("Connected")
+    def _next_watch_ms(self) -> int:
+        """Période adaptative après une sonde réussie : 1 s en run, sinon doublée (max 10 s)
+        tant que la liaison tient. Un échec arrête le heartbeat ; _start_watch repart de 3 s."""
+        if self._state == "running":
+            nxt = WATCH_RUNNING_MS
         else:
-            self._set_connected_ui(False, initialize=True)
-            if self.devices.get("ur3"):
-                self.info.add("UR3: connexion perdue.", level="warning")
-                try: self.devices["ur3"].close()
-                except Exception: pass
-                self.devices["ur3"] = None
-            self.var_status.set("Disconnected")
-        self.after(WATCH_PERIOD_MS, self._watch_period)
+            nxt = min(WATCH_MAX_MS, self._watch_interval * 2)
+        self._watch_interval = nxt
+        return nxt
 
     # ------------------------------------------------------------------
     # Run watch (sondage fin de programme)
@@ -329,117 +452,221 @@ class WinRobotArm(tk.LabelFrame):
 
     def _start_run_watch(self):
         """Démarre le polling tant que l’UI est en 'running'."""
-        if self._run_watch_id:  # déjà actif
+        if self._run_watch_active:  # déjà actif
             return
+        self._run_watch_active = True
         # premier tick immédiat
         self._run_watch()
 
     def _stop_run_watch(self):
         """Arrête le polling si actif."""
-        if self._run_watch_id is not None:
-            try:
-                self.after_cancel(self._run_watch_id)
-            except Exception:
-                pass
-            self._run_watch_id = None
+        self._run_watch_active = False
+        self._cancel_after(self._run_watch_id)
+        self._run_watch_id = None
 
     def _run_watch(self):
+        self._run_watch_id = None
         # Si l’UI n’est plus en 'running', couper le polling
         if self._state != "running":
             self._stop_run_watch()
             return
+        self._call_arm(self._MC_PROGRAM_STATE, self._on_run_watch_state)
 
-        try:
-            arm = self._get_ur3()
-            raw = arm.get_program_state()            # ex: "programState: PLAYING"
-            canon = self._canon_prog_state(raw)      # RUNNING / PAUSED / STOPPED / UNKNOWN
+    def _on_run_watch_state(self, raw, err):
+        if not self._run_watch_active:  # arrêté pendant l'aller-retour Dashboard
+            return
+        if err is not None:
+            self.info.add(f"Run watch: erreur sondage état programme → {err}", level="warning")
+            self._stop_run_watch()
+            return
 
-            # (optionnel) refléter ce qu’on lit dans le label pour debug
-            try:
-                self.var_prog_state.set(raw)
-            except Exception:
-                pass
-
-            if canon == "STOPPED":
-                self.info.add("UR3: programme terminé (state=STOPPED).")
-                self._set_state("idle")              # → Play actif, Pause/Stop gris
-                self._stop_run_watch()
-            elif canon == "PAUSED" and self._state == "running":
-                # Le robot s’est mis en pause sans passer par le bouton
-                self.info.add("UR3: programme en pause (détecté par watcher).")
-                self._set_state("paused")
+        canon = self._canon_prog_state(raw)      # RUNNING / PAUSED / STOPPED / UNKNOWN
+        # (optionnel) refléter ce qu’on lit dans le label pour debug
+        self._set_var(self.var_prog_state, raw)
 
-        except Exception as e:
-            self.info.add(f"Run watch: erreur sondage état programme → {e}", level="warning")
+        if canon == "STOPPED":
+            self.info.add("UR3: programme terminé (state=STOPPED).")
+            self._set_state("idle")              # → Play actif, Pause/Stop gris
             self._stop_run_watch()
-        finally:
-            if self._state == "running":
-                self._run_watch_id = self.after(RUN_POLL_MS, self._run_watch)
+        elif canon == "PAUSED" and self._state == "running":
+            # Le robot s’est mis en pause sans passer par le bouton
+            self.info.add("UR3: programme en pause (détecté par watcher).")
+            self._set_state("paused")
+
+        if self._state == "running":
+            self._run_watch_id = self._schedule(RUN_POLL_MS, self._run_watch)
+        else:
+            self._run_watch_active = False
+
+    # -----------------------------------------------------------------------
+    # Timers after() suivis
+    # -----------------------------------------------------------------------
+    def _schedule(self, ms: int, fn, *args) -> str:
+        """after() dont l'id est suivi jusqu'à l'exécution : annulable en bloc par _cancel_scheduled."""
+        aid = None
+        def _run():
+            self._after_ids.discard(aid)
+            fn(*args)
+        aid = self.after(ms, _run)
+        self._after_ids.add(aid)
+        return aid
+
+    def _cancel_after(self, aid):
+        if aid is None:
+            return
+        self._after_ids.discard(aid)
+        try:
+            self.after_cancel(aid)
+        except tk.TclError:
+            pass
+
+    def _cancel_scheduled(self):
+        for aid in tuple(self._after_ids):
+            self._cancel_after(aid)
+        self._watch_id = None
+        self._run_watch_id = None
+
+    def destroy(self):
+        self._cancel_scheduled()
+        self._dash_q.put(None)  # arrêt du worker Dashboard
+        self._scale_executor.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
 
     # -----------------------------------------------------------------------
     # Dashboard helpers
     # -----------------------------------------------------------------------
-    def _call_dash(self, label: str, func):
+    def _dash_loop(self):
+        """Thread worker : exécute les jobs Dashboard un par un, hors du thread Tk,
+        puis renvoie (résultat, erreur) au callback via after(0, …)."""
+        while True:
+            item = self._dash_q.get()
+            if item is None:
+                return  # destroy()
+            job, on_done = item
+            result, err = self._exec_dash(job)
+            try:
+                self.after(0, on_done, result, err)
+            except (RuntimeError, tk.TclError):
+                return  # fenêtre détruite / mainloop arrêtée
+
+    @staticmethod
+    def _exec_dash(job):
         try:
-            arm = self._get_ur3()
-            resp = func(arm)
-            txt = (resp or "").lower()
-            if ("remote control mode" in txt) or ("reconnect to port 29999" in txt) or ("not allowed due to safety" in txt):
-                self.info.add(f"UR3 {label} → {resp}")
-                self._force_need_reconnect(reason=resp)
-                return
-            self.info.add(f"UR3 {label} → {resp}")
-        except (RuntimeError, UR3ConnectionError) as e:
-            self.info.add(f"UR3 {label} → ERREUR : {e}", level="error")
-            self.var_status.set("Error")
+            return job(), None
+        except Exception as e:
+            return None, e
+
+    def _submit_dash(self, job, on_done, *, blocking: bool = False, urgent: bool = False):
+        """job() part sur le worker, on_done(result, err) revient sur le thread Tk.
+        blocking=True : exécution immédiate sur le thread appelant (séquences Auto/JSON).
+        urgent=True : en tête de file (stop), n'attend que le job en cours."""
+        if blocking:
+            on_done(*self._exec_dash(job))
+        elif urgent:
+            q = self._dash_q
+            with q.not_empty:
+                q.queue.appendleft((job, on_done))
+                q.unfinished_tasks += 1
+                q.not_empty.notify()
+        else:
+            self._dash_q.put((job, on_done))
 
-    def on_power_on(self):  self._call_dash("power on",  lambda arm: arm.power_on())
-    def on_power_off(self): self._call_dash("power off", lambda arm: arm.power_off())
-    def on_brake_release(self): self._call_dash("brake release", lambda arm: arm.brake_release())
+    def _submit_scale(self, job, on_done):
+        """Comme _submit_dash, mais sur le pool balance (hors file Dashboard)."""
+        self._scale_executor.submit(self._exec_dash, job).add_done_callback(
+            partial(self._deliver_scale, on_done))
 
-    def on_refresh_modes(self):
+    def _deliver_scale(self, on_done, fut):
+        if fut.cancelled():
+            return  # destroy()
         try:
-            arm = self._get_ur3()
-            rm = arm.get_robot_mode()
-            sm = arm.get_safety_mode()
-            self.var_robot_mode.set(rm)
-            self.var_safety_mode.set(sm)
-            self.info.add(f"UR3 robotmode → {rm}")
-            self.info.add(f"UR3 safetymode → {sm}")
-
-            prog  = arm.get_loaded_program()
-            state = arm.get_program_state()
-            self.var_program.set(prog)        # "Loaded program: …"
-            self.var_prog_state.set(state)    # "programState: PLAYING/PAUSE/…"
-            self.info.add(f"UR3 programme → {prog}")
-            self.info.add(f"UR3 state → {state}")
-
-            # 👇 Aligne l’UI sur l’état robot
-            canon = self._canon_prog_state(state)  # RUNNING / PAUSED / STOPPED / UNKNOWN
-            if canon == "RUNNING":
-                self._set_state("running")
-                self._start_run_watch()  # relance le watcher si besoin
-            elif canon == "PAUSED":
-                self._set_state("paused")
-            elif canon == "STOPPED":
-                self._set_state("idle")
-                self._stop_run_watch()
+            self.after(0, on_done, *fut.result())
+        except (RuntimeError, tk.TclError):
+            pass  # fenêtre détruite / mainloop arrêtée
 
-        except (RuntimeError, UR3ConnectionError) as e:
-            self.info.add(f"UR3 refresh modes → ERREUR : {e}", level="error")
-            self.var_status.set("Error")
+    def _with_arm(self, func):
+        return func(self._get_ur3())
+
+    def _call_arm(self, func, on_done, *, blocking: bool = False, urgent: bool = False):
+        """Comme _submit_dash, mais func reçoit le bras UR3 courant."""
+        self._submit_dash(partial(self._with_arm, func), on_done, blocking=blocking, urgent=urgent)
+
+    def _on_dash_reply(self, label: str, resp, err):
+        if err is not None:
+            self.info.add(f"UR3 {label} → ERREUR : {err}", level="error")
+            self._set_var(self.var_status, "Error")
+            return
+        txt = (resp or "").lower()
+        if ("remote control mode" in txt) or ("reconnect to port 29999" in txt) or ("not allowed due to safety" in txt):
+            self.info.add(f"UR3 {label} → {resp}")
+            self._force_need_reconnect(reason=resp)
+            return
+        self.info.add(f"UR3 {label} → {resp}")
+
+    def _call_dash(self, label: str, func, *, blocking: bool = False, urgent: bool = False):
+        """Envoie func(arm) au worker Dashboard ; blocking=True l'exécute tout de suite (séquences)."""
+        self._call_arm(func, partial(self._on_dash_reply, label), blocking=blocking, urgent=urgent)
+
+    def on_power_on(self):  self._call_dash("power on",  self._MC_POWER_ON)
+    def on_power_off(self): self._call_dash("power off", self._MC_POWER_OFF)
+    def on_brake_release(self): self._call_dash("brake release", self._MC_BRAKE_RELEASE)
+
+    @staticmethod
+    def _read_modes(arm):
+        # Une seule écriture pour les 4 requêtes : 1 aller-retour Dashboard au lieu de 4
+        return arm.batch_dashboard(MODES_BATCH)
+
+    def on_refresh_modes(self, *, blocking: bool = False):
+        self._call_arm(self._read_modes, self._on_modes, blocking=blocking)
+
+    def _on_modes(self, result, err):
+        if err is not None:
+            self.info.add(f"UR3 refresh modes → ERREUR : {err}", level="error")
+            self._set_var(self.var_status, "Error")
+            return
+        rm, sm, prog, state = result
+        self._set_var(self.var_robot_mode, rm)
+        self._set_var(self.var_safety_mode, sm)
+        self._set_var(self.var_program, prog)        # "Loaded program: …"
+        self._set_var(self.var_prog_state, state)    # "programState: PLAYING/PAUSE/…"
+        self.info.add_many([
+            f"UR3 robotmode → {rm}",
+            f"UR3 safetymode → {sm}",
+            f"UR3 programme → {prog}",
+            f"UR3 state → {state}",
+        ])
+
+        # 👇 Aligne l’UI sur l’état robot
+        canon = self._canon_prog_state(state)  # RUNNING / PAUSED / STOPPED / UNKNOWN
+        if canon == "RUNNING":
+            self._set_state("running")
+            self._start_run_watch()  # relance le watcher si besoin
+        elif canon == "PAUSED":
+            self._set_state("paused")
+        elif canon == "STOPPED":
+            self._set_state("idle")
+            self._stop_run_watch()
 
     # -----------------------------------------------------------------------
     # Programmes: état chargé / refresh / autoload
     # -----------------------------------------------------------------------
     def _extract_loaded_path(self, s: str) -> str:
+        if s == self._last_prog_raw:
+            return self._last_prog_parsed
+        raw = s
         s = (s or "").strip()
         if not s:
-            return ""
-        return s.split(":", 1)[1].strip() if ":" in s else s
+            parsed = ""
+        else:
+            parsed = s.split(":", 1)[1].strip() if ":" in s else s
+        self._last_prog_raw, self._last_prog_parsed = raw, parsed
+        return parsed
+
+    def _on_program_var_write(self, *_):
+        self._loaded_path_cache = self._extract_loaded_path(self.var_program.get())
 
     def _current_loaded_path(self) -> str:
-        return self._extract_loaded_path(self.var_program.get())
+        return self._loaded_path_cache
 
     def _on_program_selected(self, _event=None):
         if not self._combo_events_enabled():
@@ -451,145 +678,223 @@ class WinRobotArm(tk.LabelFrame):
             return
         self.on_load_selected_program()
 
-    def on_refresh_programs(self):
+    @staticmethod
+    def _read_programs(arm):
+        progs = arm.list_programs()
         try:
-            arm = self._get_ur3()
-            progs = arm.list_programs()
-            if not progs:
-                self.info.add("UR3: aucun programme .urp trouvé sur /programs", level="warning")
+            loaded_line = arm.get_loaded_program()
+        except Exception:
+            loaded_line = None
+        # Ensemble construit sur le worker : test d'appartenance O(1) côté Tk
+        return progs, frozenset(progs), loaded_line
 
-            with self._combo_guard():
-                self.cmb_programs["values"] = progs
-                try:
-                    loaded_line = arm.get_loaded_program()
-                except Exception:
-                    loaded_line = self.var_program.get()
-                loaded_path = self._extract_loaded_path(loaded_line)
-                if loaded_path and loaded_path in progs:
-                    self.var_selected_program.set(loaded_path)
-                else:
-                    self.var_selected_program.set(loaded_path if loaded_path else (progs[0] if progs else ""))
-
-            self.info.add(f"UR3: {len(progs)} programme(s) trouvé(s).")
-        except (RuntimeError, UR3ConnectionError) as e:
-            self.info.add(f"UR3 refresh programs → ERREUR : {e}", level="error")
-
-    def on_load_selected_program(self):
+    def on_refresh_programs(self, *, blocking: bool = False):
+        self._call_arm(self._read_programs, self._on_programs, blocking=blocking)
+
+    def _on_programs(self, result, err):
+        if err is not None:
+            self.info.add(f"UR3 refresh programs → ERREUR : {err}", level="error")
+            return
+        progs, progs_set, loaded_line = result
+        if not progs:
+            self.info.add("UR3: aucun programme .urp trouvé sur /programs", level="warning")
+
+        with self._combo_guard():
+            self.cmb_programs["values"] = progs
+            if loaded_line is None:
+                loaded_line = self._var_value(self.var_program)
+            loaded_path = self._extract_loaded_path(loaded_line)
+            if loaded_path and loaded_path in progs_set:
+                self.var_selected_program.set(loaded_path)
+            else:
+                self.var_selected_program.set(loaded_path if loaded_path else (progs[0] if progs else ""))
+
+        self.info.add(f"UR3: {len(progs)} programme(s) trouvé(s).")
+
+    def on_load_selected_program(self, *, blocking: bool = False):
+        """load sur le worker Dashboard ; blocking=True (séquences Auto/JSON, qui enchaînent
+        pré-checks + play juste après) : exécution immédiate."""
         prog = self.var_selected_program.get().strip()
         if not prog:
             self.info.add("Load program → aucun programme sélectionné.", level="warning")
             return
+        self._call_arm(partial(self._load_job, prog), partial(self._on_program_loaded, prog),
+                       blocking=blocking)
 
-        def _do(arm):
-            resp = arm.load_program(prog)
-            return f"load {prog} → {resp}"
+    @staticmethod
+    def _load_job(prog: str, arm):
+        return f"load {prog} → {arm.load_program(prog)}"
 
-        self._call_dash("load", _do)
+    def _on_program_loaded(self, prog: str, resp, err):
+        self._on_dash_reply("load", resp, err)
 
         with self._combo_guard():
             self.var_selected_program.set(prog)
 
-        self.after(150, self.on_refresh_modes)
+        self._schedule(150, self.after_idle, self.on_refresh_modes)  # délai robot, puis au repos de Tk
 
     # -----------------------------------------------------------------------
     # Play / Pause / Stop
     # -----------------------------------------------------------------------
     def on_play(self):
         try:
+            # Pré-checks lisant l'UI (programme, vial) sur le thread Tk ;
+            # porte et plateau partent sur le pool balance, RTDE sur le worker
             arm = self._get_ur3()
             loaded_path = self._current_loaded_path()
             prog_name = loaded_path.split("/")[-1] if loaded_path else ""
-            low = prog_name.lower()
-            if   "p1" in low: self._play_p1(arm)
-            elif "p2" in low: self._play_p2(arm)
-            elif "p3" in low: self._play_p3(arm)
-            elif "p4" in low: self._play_p4(arm)
-            else:             self._play_default(arm)
-
-            before = arm.get_program_state()
-            resp   = arm.play()
-            self._set_state("running")
-            self.btn_stop.configure(state="normal")
-            self._start_run_watch()
-            self.after(150, self.on_refresh_modes)
-            after  = arm.get_program_state()
-            self.info.add(f"UR3 play → state_before={before} ; play→{resp} ; state_after={after}")
+            m = self._PLAY_DISPATCH_RE.search(prog_name.lower())
+            play_fn = self._PLAY_TABLE[m.group(1)] if m else WinRobotArm._play_default
+            if play_fn in self._PAN_CHECKED:
+                # Porte + vérif plateau sur le pool balance : la suite reprend dans _continue_play
+                if not self._get_selected_vial_any()[0]:
+                    play_fn(self, arm)  # lève l'erreur "vial requise" habituelle
+                self._check_pan_async(partial(self._continue_play, arm, play_fn, "pan_empty"),
+                                      open_door=True)
+                return
+            if play_fn in self._HEAD_CHECKED:
+                # ReadDosingHead sur le pool balance aussi : la suite reprend dans _continue_play
+                self._read_head_async(partial(self._continue_play, arm, play_fn, "head_name"))
+                return
+            setup = play_fn(self, arm, defer=True)
         except (RuntimeError, UR3ConnectionError, ValueError) as e:
             self.info.add(f"UR3 play → ERREUR : {e}", level="error")
-            self.var_status.set("Error")
+            self._set_var(self.var_status, "Error")
+            return
+        self._send_play(setup)
 
-    def on_pause(self):
+    def _continue_play(self, arm: UR3, play_fn, key: str, measured):
+        """Suite de on_play une fois la mesure balance revenue (key = pan_empty / head_name)."""
         try:
-            arm = self._get_ur3()
-            if self._state == "running":
-                resp = arm.pause()
-                self.info.add(f"UR3 pause → {resp}")
-                self._set_state("paused")
-            elif self._state == "paused":
-                resp = arm.play()
-                self.info.add(f"UR3 continue (play) → {resp}")
-                self._set_state("running")
-            else:
-                self.info.add("Pause ignorée (état idle).", level="warning")
-                return
-            self.after(120, self.on_refresh_modes)
-        except (RuntimeError, UR3ConnectionError) as e:
-            self.info.add(f"UR3 pause/continue → ERREUR : {e}", level="error")
-            self.var_status.set("Error")
+            setup = play_fn(self, arm, defer=True, **{key: measured})
+        except (RuntimeError, UR3ConnectionError, ValueError) as e:
+            self.info.add(f"UR3 play → ERREUR : {e}", level="error")
+            self._set_var(self.var_status, "Error")
+            return
+        self._send_play(setup)
+
+    def _send_play(self, setup=None):
+        # stop + registre RTDE (setup) puis play + états : tout part sur le worker
+        job, msg = setup if setup else (None, None)
+        self._call_arm(partial(self._play_job, self.info.debug_enabled, job),
+                       partial(self._on_played, msg))
+
+    @staticmethod
+    def _play_job(debug: bool, setup_job, arm):
+        if setup_job is not None:
+            setup_job()
+        # play + programState pipelinés : 1 aller-retour ; état "avant" seulement en debug
+        return arm.play_with_state_probe(with_before=debug)
+
+    def _on_played(self, setup_msg, result, err):
+        if err is not None:
+            self.info.add(f"UR3 play → ERREUR : {err}", level="error")
+            self._set_var(self.var_status, "Error")
+            return
+        if setup_msg:
+            self.info.add(setup_msg)
+        before, resp, after = result
+        if before is not None:
+            self.info.add(f"UR3 play → state_before={before}", level="debug")
+        self._set_state("running")
+        self.btn_stop.configure(state="normal")
+        self._start_run_watch()
+        self._schedule(150, self.after_idle, self.on_refresh_modes)  # délai robot, puis au repos de Tk
+        self.info.add(f"UR3 play → play→{resp} ; state_after={after}")
+
+    def on_pause(self):
+        if self._state == "running":
+            self._call_arm(self._MC_PAUSE, partial(self._on_paused, "pause", "paused"))
+        elif self._state == "paused":
+            self._call_arm(self._MC_PLAY, partial(self._on_paused, "continue (play)", "running"))
+        else:
+            self.info.add("Pause ignorée (état idle).", level="warning")
+
+    def _on_paused(self, label: str, new_state: str, resp, err):
+        if err is not None:
+            self.info.add(f"UR3 pause/continue → ERREUR : {err}", level="error")
+            self._set_var(self.var_status, "Error")
+            return
+        self.info.add(f"UR3 {label} → {resp}")
+        self._set_state(new_state)
+        self._schedule(120, self.after_idle, self.on_refresh_modes)
 
     def on_stop(self):
-        self._call_dash("stop", lambda arm: arm.stop())
+        # arrêt d'urgence (Escape aussi) : devant tout ce qui attend dans la file
+        self._call_dash("stop", self._MC_STOP, urgent=True)
         self._stop_run_watch()
         self._set_state("idle")
 
     # -----------------------------------------------------------------------
     # Scénarios P1 / P2 / P3 / P4
     # -----------------------------------------------------------------------
-    def _play_p1(self, arm: UR3):
+    # Fin commune des scénarios : stop + écriture du registre RTDE
+    def _arm_setup(self, arm: UR3, setter: str | None, value: int | None, msg: str | None, defer: bool):
+        """defer=False : exécuté tout de suite (séquences Auto/JSON) ;
+        defer=True : renvoie (job, message) que _send_play exécute sur le worker avant play."""
+        job = partial(self._arm_setup_job, arm, setter, value)
+        if defer:
+            return job, msg
+        job()
+        if msg:
+            self.info.add(msg)
+        return None
+
+    @staticmethod
+    def _arm_setup_job(arm: UR3, setter: str | None, value: int | None):
+        arm.stop()
+        if setter is not None:
+            getattr(arm, setter)(value)
+
+    def _play_p1(self, arm: UR3, pan_empty: bool | None = None, *, defer: bool = False):
+        """pan_empty fourni (mesure déjà faite en asynchrone) → pas de ré-échantillonnage."""
         vial_id, group = self._get_selected_vial_any()
         if not vial_id:
             self.info.add("Play (P1) → aucune vial E* ni F* sélectionnée.", level="warning")
             raise RuntimeError("Vial requise pour P1")
 
         vnum = self._vial_id_to_number(vial_id)
-        self._ensure_scale_door_open()
-        if not self._is_pan_empty():
+        if pan_empty is None:
+            self._ensure_scale_door_open()
+            pan_empty = self._is_pan_empty()
+        if not pan_empty:
             self.info.add("Play (P1) → La pan n'est pas vide. Merci de vider la balance, puis relance.", level="warning")
             raise RuntimeError("Pan non vide")
-        arm.stop()
-        arm.set_vials_nb(vnum)
-        self.info.add(f"UR3 RTDE: VialsNB ← {vnum} ({vial_id}, groupe {group})")
+        return self._arm_setup(arm, "set_vials_nb", vnum,
+                               f"UR3 RTDE: VialsNB ← {vnum} ({vial_id}, groupe {group})", defer)
 
-    def _play_p2(self, arm: UR3):
+    def _play_p2(self, arm: UR3, head_name: str | None = None, *, defer: bool = False):
+        """head_name fourni (lu en asynchrone) → pas de ReadDosingHead ici."""
         storage_id = self.get_selected_storage()
         if not storage_id:
             self.info.add("Play (P2) → aucun Storage sélectionné (S1..S4).", level="warning")
             raise RuntimeError("Storage requis")
         dnum = self._storage_id_to_number(storage_id)
-        if self._is_dispenser_present():
-            name = self._get_scale_dispenser_name()
+        name = self._get_scale_dispenser_name() if head_name is None else head_name
+        if name:
             self.info.add(f"Play (P2) → Un dispenser est déjà présent sur la balance ({name or '—'}). Retire-le puis relance.", level="warning")
             raise RuntimeError("Dispenser déjà présent")
-        arm.stop()
-        arm.set_disp_nb(int(dnum))
-        self.info.add(f"UR3 RTDE: DispNB ← {dnum} (Storage {storage_id})")
+        return self._arm_setup(arm, "set_disp_nb", int(dnum),
+                               f"UR3 RTDE: DispNB ← {dnum} (Storage {storage_id})", defer)
 
-    def _play_p3(self, arm: UR3):
+    def _play_p3(self, arm: UR3, pan_empty: bool | None = None, *, defer: bool = False):
         vial_id, group = self._get_selected_vial_any()
         if not vial_id:
             self.info.add("Play (P3) → aucune vial E* ni F* sélectionnée.", level="warning")
             raise RuntimeError("Vial requise pour P3")
         vnum = self._vial_id_to_number(vial_id)
-        self._ensure_scale_door_open()
-        if self._is_pan_empty():
+        if pan_empty is None:
+            self._ensure_scale_door_open()
+            pan_empty = self._is_pan_empty()
+        if pan_empty:
             self.info.add("Play (P3) → La pan est pas vide. Le mouvement ne sert à rien.", level="warning")
             raise RuntimeError("Pan vide → inutile")
-        arm.stop()
-        arm.set_vials_nb(vnum)  # GPii[20]
-        self.info.add(f"UR3 RTDE: VialsNB ← {vnum} ({vial_id}, groupe {group})")
+        return self._arm_setup(arm, "set_vials_nb", vnum,  # GPii[20]
+                               f"UR3 RTDE: VialsNB ← {vnum} ({vial_id}, groupe {group})", defer)
 
-    def _play_p4(self, arm: UR3):
-        name = self._get_scale_dispenser_name()
+    def _play_p4(self, arm: UR3, head_name: str | None = None, *, defer: bool = False):
+        """head_name fourni (lu en asynchrone) → pas de ReadDosingHead ici."""
+        name = self._get_scale_dispenser_name() if head_name is None else head_name
         if not name:
             self.info.add("Play (P4) → Aucun dosing head détecté (nom vide). Place un dispenser puis relance.", level="warning")
             raise RuntimeError("Pas de dispenser")
@@ -597,17 +902,22 @@ class WinRobotArm(tk.LabelFrame):
         if not storage_id or dnum is None:
             self.info.add(f"Play (P4) → Substance '{name}' introuvable dans STORAGE_CONFIG['labels'].", level="warning")
             raise RuntimeError("Label inconnu")
-        arm.stop()
-        arm.set_disp_nb(int(dnum))  # GPii[21]
-        self.info.add(f"UR3 RTDE: DispNB ← {dnum} (via label '{name}', storage {storage_id})")
+        return self._arm_setup(arm, "set_disp_nb", int(dnum),  # GPii[21]
+                               f"UR3 RTDE: DispNB ← {dnum} (via label '{name}', storage {storage_id})", defer)
 
-    def _play_default(self, arm: UR3):
+    def _play_default(self, arm: UR3, *, defer: bool = False):
         vial_id, group = self._get_selected_vial_any()
-        arm.stop()
-        if vial_id:
-            vnum = self._vial_id_to_number(vial_id)
-            arm.set_vials_nb(vnum)
-            self.info.add(f"UR3 RTDE: VialsNB ← {vnum} ({vial_id}, groupe {group})")
+        if not vial_id:
+            return self._arm_setup(arm, None, None, None, defer)
+        vnum = self._vial_id_to_number(vial_id)
+        return self._arm_setup(arm, "set_vials_nb", vnum,
+                               f"UR3 RTDE: VialsNB ← {vnum} ({vial_id}, groupe {group})", defer)
+
+    # Dispatch Play : "pN" dans le nom du programme → scénario (un seul scan du nom)
+    _PLAY_DISPATCH_RE = re.compile(r"p([1-4])")
+    _PLAY_TABLE = {"1": _play_p1, "2": _play_p2, "3": _play_p3, "4": _play_p4}
+    _PAN_CHECKED = (_play_p1, _play_p3)  # scénarios avec vérif plateau asynchrone
+    _HEAD_CHECKED = (_play_p2, _play_p4)  # scénarios avec lecture dosing head asynchrone
 
     # -----------------------------------------------------------------------
     # Accès Vials / Storage (UI)
@@ -633,83 +943,144 @@ class WinRobotArm(tk.LabelFrame):
     # -----------------------------------------------------------------------
     def _is_scale_door_open(self) -> bool:
         wm = self._get_scale()
-        if not wm:
-            return False
+        return bool(wm) and self._door_is_open(wm)
+
+    @staticmethod
+    def _door_is_open(wm) -> bool:
         try:
             pos = wm.get_door_positions() or {}
             if not isinstance(pos, dict):
                 return False
-            def _to_int(v):
-                try:
-                    return int(v) if str(v).isdigit() else int(float(v))
-                except Exception:
-                    return 0
-            return any(_to_int(v) > 0 for v in pos.values())
+            return any(_safe_pos_int(v) > 0 for v in pos.values())
         except Exception:
             return False
 
+    @staticmethod
+    def _open_scale_door_job(wm) -> tuple[str, str]:
+        """Ouvre la porte si besoin, sans appel Tk (utilisable sur le pool balance) ;
+        renvoie (message, niveau) à logger côté Tk."""
+        try:
+            if WinRobotArm._door_is_open(wm):
+                return "Porte balance déjà ouverte.", "info"
+            return f"Open door (balance) → {wm.open_door()}", "info"
+        except Exception as e:
+            return f"Open door (balance) a échoué: {e}", "error"
+
     def _ensure_scale_door_open(self):
+        """Version synchrone (séquences Auto/JSON)."""
         wm = self._get_scale()
         if not wm:
             self.info.add("Balance non connectée → je ne peux pas ouvrir la porte.", level="warning")
             return
-        try:
-            if self._is_scale_door_open():
-                self.info.add("Porte balance déjà ouverte.")
-                return
-            resp = wm.open_door()
-            self.info.add(f"Open door (balance) → {resp}")
-        except Exception as e:
-            self.info.add(f"Open door (balance) a échoué: {e}", level="error")
+        msg, level = self._open_scale_door_job(wm)
+        self.info.add(msg, level=level)
 
     def _is_pan_empty(self) -> bool:
+        """Version synchrone (séquences Auto/JSON)."""
         wm = self._get_scale()
         if not wm:
             self.info.add("Balance non connectée → impossible de vérifier que la pan est vide.", level="warning")
             return False  # par prudence on bloque
+        min_mg = float(SCALE_CONFIG.get("vial_presence_min_mg", 1000.0))
         try:
-            min_mg = float(SCALE_CONFIG.get("vial_presence_min_mg", 1000.0))
-            present, stats = wm.is_pan_present(min_present_mg=min_mg, samples=8, sleep_s=0.04)
-            mean_mg   = (stats.get("mean_gross_g") or 0.0) * 1000.0
-            thr_mg    = (stats.get("threshold_g") or (min_mg/1000.0)) * 1000.0
-            std_mg    = (stats.get("std_gross_g") or 0.0) * 1000.0
-            n_samples = int(stats.get("n") or 0)
-            if present:
-                self.info.add(f"Plateau OCCUPÉ (Gross mean={mean_mg:.1f} mg, σ={std_mg:.1f} mg, seuil={thr_mg:.1f} mg, n={n_samples})", level="warning")
-                return False
-            else:
-                self.info.add(f"Plateau VIDE (Gross mean={mean_mg:.1f} mg, σ={std_mg:.1f} mg, seuil={thr_mg:.1f} mg, n={n_samples})")
-                return True
+            res = wm.is_pan_present(min_present_mg=min_mg, samples=8, sleep_s=0.04)
         except Exception as e:
-            self.info.add(f"Balance: is_pan_present() a échoué → {e}", level="error")
+            return self._pan_verdict(min_mg, None, e)
+        return self._pan_verdict(min_mg, res, None)
+
+    def _check_pan_async(self, on_result, *, open_door: bool = False):
+        """Échantillonnage (8 × 40 ms) sur le pool balance : le mainloop ne dort jamais.
+        open_door=True : ouverture de la porte d'abord, sur le pool aussi.
+        on_result(pan_empty: bool) est rappelé sur le thread Tk."""
+        wm = self._get_scale()
+        if not wm:
+            if open_door:
+                self.info.add("Balance non connectée → je ne peux pas ouvrir la porte.", level="warning")
+            self.info.add("Balance non connectée → impossible de vérifier que la pan est vide.", level="warning")
+            on_result(False)  # par prudence on bloque
+            return
+        min_mg = float(SCALE_CONFIG.get("vial_presence_min_mg", 1000.0))
+        self._submit_scale(
+            partial(self._door_and_pan_job, wm, min_mg, open_door),
+            partial(self._on_door_and_pan, min_mg, on_result),
+        )
+
+    @classmethod
+    def _door_and_pan_job(cls, wm, min_mg: float, open_door: bool):
+        door = cls._open_scale_door_job(wm) if open_door else None
+        return door, wm.is_pan_present(min_present_mg=min_mg, samples=8, sleep_s=0.04)
+
+    def _on_door_and_pan(self, min_mg: float, on_result, res, err):
+        pan = None
+        if err is None:
+            door, pan = res
+            if door is not None:
+                self.info.add(door[0], level=door[1])
+        on_result(self._pan_verdict(min_mg, pan, err))
+
+    def _pan_verdict(self, min_mg: float, res, err) -> bool:
+        if err is not None:
+            self.info.add(f"Balance: is_pan_present() a échoué → {err}", level="error")
+            return False
+        present, stats = res
+        mean_mg   = (stats.get("mean_gross_g") or 0.0) * 1000.0
+        thr_mg    = (stats.get("threshold_g") or (min_mg/1000.0)) * 1000.0
+        std_mg    = (stats.get("std_gross_g") or 0.0) * 1000.0
+        n_samples = int(stats.get("n") or 0)
+        if present:
+            self.info.add(f"Plateau OCCUPÉ (Gross mean={mean_mg:.1f} mg, σ={std_mg:.1f} mg, seuil={thr_mg:.1f} mg, n={n_samples})", level="warning")
             return False
+        self.info.add(f"Plateau VIDE (Gross mean={mean_mg:.1f} mg, σ={std_mg:.1f} mg, seuil={thr_mg:.1f} mg, n={n_samples})")
+        return True
 
     def _get_scale_dispenser_name(self) -> str:
+        """Version synchrone (séquences Auto/JSON)."""
         wm = self._get_scale()
-        if not wm:
-            return ""
+        return self._dispenser_name_job(wm) if wm else ""
+
+    @staticmethod
+    def _dispenser_name_job(wm) -> str:
         try:
             return (wm.get_dosing_head_name() or "").strip()
         except Exception:
             return ""
 
-    def _is_dispenser_present(self) -> bool:
-        return bool(self._get_scale_dispenser_name())
+    def _read_head_async(self, on_result):
+        """ReadDosingHead sur le pool balance ; on_result(nom: str) est rappelé sur le
+        thread Tk ('' si balance absente ou lecture en échec)."""
+        wm = self._get_scale()
+        if not wm:
+            on_result("")
+            return
+        self._submit_scale(partial(self._dispenser_name_job, wm),
+                           partial(self._on_head_read, on_result))
+
+    @staticmethod
+    def _on_head_read(on_result, name, err):
+        on_result(name or "")
 
     def _norm_label(self, s: str) -> str:
         return " ".join(str(s or "").strip().lower().split())
 
+    def _storage_labels_index(self, labels: dict, id_to_number: dict) -> dict:
+        """Index {label normalisé: (sid, numéro)}, reconstruit seulement si la config a changé."""
+        key = (id(labels), id(id_to_number))
+        if self._storage_label_index is None or self._storage_label_cfg_id != key:
+            index = {}
+            for sid, lab in labels.items():
+                try:
+                    num = int(id_to_number.get(sid, sid[1:] if isinstance(sid, str) and sid.upper().startswith("S") else sid))
+                except Exception:
+                    continue
+                index.setdefault(self._norm_label(lab), (str(sid), num))  # 1er match gagne
+            self._storage_label_index = index
+            self._storage_label_cfg_id = key
+        return self._storage_label_index
+
     def _find_storage_by_substance_label(self, substance_name: str) -> tuple[str | None, int | None]:
         labels = STORAGE_CONFIG.get("labels", {}) or {}
         id_to_number = STORAGE_CONFIG.get("id_to_number", {}) or {}
         target = self._norm_label(substance_name)
         if not target or not isinstance(labels, dict):
             return None, None
-        for sid, lab in labels.items():
-            if self._norm_label(lab) == target:
-                try:
-                    num = int(id_to_number.get(sid, sid[1:] if isinstance(sid, str) and sid.upper().startswith("S") else sid))
-                    return str(sid), num
-                except Exception:
-                    pass
-        return None, None
+        return self._storage_labels_index(labels, id_to_number).get(target, (None, None))
@@ -4,18 +4,76 @@
 #-------------------------------------------------------------------------------
 
 import tkinter as tk
-import tkinter.ttk as ttk
+import queue
+import re
+from collections import OrderedDict
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 
 from config import SCALE_CONFIG
 from guiUtils import GUIFactory, ToolTip
 from deviceScale import WM
 
-WATCH_PERIOD_MS = 5000  # check connexion toutes les 5 s
+WATCH_IDLE_S = 30.0  # sonde de liaison seulement après 30 s sans appel WS réussi
+LOG_FLUSH_MS = 50  # logs du thread dosing : file vidée côté Tk toutes les 50 ms…
+LOG_FLUSH_MAX = 32  # … au plus 32 messages par passage
+LOG_Q_MAX = 256  # file bornée : en rafale, les plus anciens sont abandonnés
+UI_READ_MAX_AGE_MS = 250  # clics rapprochés Lire/Check/Read head : servis depuis le cache WM
+DOSING_DEBOUNCE_S = 2.0  # même formulaire renvoyé dans ce délai → ignoré
+LOG_SUPPRESS_S = 30.0  # une erreur identique n'est réaffichée qu'après 30 s
+LOG_ONCE_MAX = 32  # nb de (niveau, message) mémorisés pour la déduplication
+
+# Saisie numérique (target / tolérances) : chiffres + un séparateur décimal, vide accepté
+_NUM_OR_EMPTY_RE = re.compile(r"\d*[.,]?\d*")
+
+
+def _is_num_or_empty(text: str) -> bool:
+    return _NUM_OR_EMPTY_RE.fullmatch(text) is not None
+
+
+def _parse_num(text: str) -> float:
+    """Champ validé → float (vide = 0, virgule acceptée)."""
+    return float(text.replace(",", ".") or "0")
+
+# Libellé UI → nom de méthode attendu par le firmware (un seul SetMethod)
+METHOD_ALIASES = {"DOSING": "Dosing"}
+
+# Paramètres WM dérivés de SCALE_CONFIG, résolus une seule fois
+_WM_STATIC_KWARGS = dict(
+    scheme=SCALE_CONFIG.get("scheme", "http"),
+    ip=SCALE_CONFIG.get("ip", "192.168.0.50"),
+    port=int(SCALE_CONFIG.get("port", 81)),
+    wsdl_path=SCALE_CONFIG.get("wsdl_path"),
+    password=SCALE_CONFIG.get("password"),
+    verify=SCALE_CONFIG.get("verify", False),
+    timeout_s=SCALE_CONFIG.get("timeout_s", 8),
+    door_ids=SCALE_CONFIG.get("door_ids", ["LeftOuter", "RightOuter"]),
+    open_width=SCALE_CONFIG.get("open_width", 100),
+    close_width=SCALE_CONFIG.get("close_width", 0),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DosingForm:
+    """Instantané (hashable) du formulaire dosing, lu une fois côté Tk."""
+    vial: str
+    sub: str
+    tgt: float
+    t_unit: str
+    tol_lo: float
+    tol_up: float
+    tol_u: str
 
 
 class WinBalance(tk.LabelFrame):
     """Pour piloter la balance via WebService (portes / zero / tare / poids / dosing)."""
+    # Valeurs des listes déroulantes, partagées par toutes les instances
+    METHODS = ("DOSING", "General Weighing")
+    UNITS = ("mg", "g")
+
     def __init__(self, parent, info_win, devices):
         super().__init__(parent, text="Balance Mettler (WebService)")
         self.info = info_win
@@ -31,29 +89,55 @@ class WinBalance(tk.LabelFrame):
         # Paramètres pour un job de dosing
         self.var_d_vial      = tk.StringVar(value="Vessel1")
         self.var_d_substance = tk.StringVar(value="")   # substance du job
-        self.var_d_target    = tk.DoubleVar(value=5.0)
+        self.var_d_target    = tk.StringVar(value="5.0")  # parsé au Start seulement
         self.var_d_tu        = tk.StringVar(value="mg")
-        self.var_d_tol_lo    = tk.DoubleVar(value=0.0)
-        self.var_d_tol_up    = tk.DoubleVar(value=0.0)
+        self.var_d_tol_lo    = tk.StringVar(value="0.0")
+        self.var_d_tol_up    = tk.StringVar(value="0.0")
         self.var_d_tol_u     = tk.StringVar(value="mg")
 
         # Dosing head (nom du dispenser en place)
         self.var_dosing_head = tk.StringVar(value="")   # substance lue sur la tête
 
         self.btn_connect = None
+        self._wm: WM | None = None  # construit au premier connect, puis conservé
+        self._connect_btn_state = None  # (state, text) appliqué en dernier
         self.btn_dosing_start = None
+        self.btn_dosing_cancel = None
+        # Lecture arrivée pendant que le cadre est masqué : affichée au prochain <Map>
+        self._pending_weight_g: float | None = None
+        self._weight_text = self.var_weight.get()  # dernier texte posé (évite les set() à l'identique)
+
+        # Pool WebService : les appels SOAP ne bloquent plus le thread Tk
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scale-io")
 
-        # Thread de polling des notifications de dosing
+        # Thread de polling des notifications de dosing ; arrêt par _dosing_stop
+        # (vérifié entre deux long-polls, le poll en vol est traité puis sortie)
         self._dosing_thread: threading.Thread | None = None
-        self._dosing_stop: threading.Event | None = None  # pour stopper le polling
+        self._dosing_stop: threading.Event | None = None
+
+        # File des logs émis par le thread dosing (vidée par lots côté Tk) ;
+        # item non-tuple = sentinelle de fin, propre à chaque job (_dosing_token)
+        self._log_q: queue.Queue = queue.Queue(maxsize=LOG_Q_MAX)
+        self._dosing_token: object | None = None
+        self._log_dropped = 0  # messages abandonnés (file pleine), signalés au vidage
+        self._log_flush_id = None
+        # Déduplication des erreurs répétées : (level, msg) → dernier affichage / répétitions masquées
+        self._log_last: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._log_counts: dict[tuple[str, str], int] = {}
+        # Dernier formulaire dosing envoyé (anti-rebond)
+        self._last_job_form = None
+        self._last_job_mono = 0.0
 
         self._build()
+        # Poids lu pendant que le cadre était masqué : affiché au prochain <Map>
+        self.bind("<Map>", self._on_map)
 
         # Auto-connexion si demandé
         if SCALE_CONFIG.get('autoconnect', True):
             self.after(200, self._auto_connect)
-        # Heartbeat (réactive le bouton si on perd la connexion)
-        self.after(WATCH_PERIOD_MS, self._watch_period)
+        # État de liaison piloté par les appels WS (WM.on_conn_change) ;
+        # sonde paresseuse armée seulement après une connexion
+        self._watch_id = None
 
     # ---------------------------------------------------------
     def _build(self):
@@ -85,14 +169,8 @@ class WinBalance(tk.LabelFrame):
 
         # --- Ligne 2 ---
         self.factory.create_label("Method", 2, 0)
-        cb_method = ttk.Combobox(
-            self,
-            textvariable=self.var_method,
-            width=18,
-            values=("DOSING", "General Weighing"),
-            state="readonly",
-        )
-        cb_method.grid(row=2, column=1, padx=5, pady=5, columnspan=2, sticky=tk.W)
+        self.factory.create_combo(self.var_method, self.METHODS, 2, 1, width=18,
+                                  columnspan=2, sticky=tk.W)
 
         b_set_method = self.factory.create_btn("Start method", self.on_start_method, 2, 3)
         ToolTip(b_set_method, "Sélectionner la méthode de pesée (menu 'Methods' de la balance)")
@@ -106,28 +184,15 @@ class WinBalance(tk.LabelFrame):
 
         # --- Ligne 4 ---
         self.factory.create_label("Target", 4, 0)
-        self.factory.create_entry(self.var_d_target, 4, 1, width=8)
-        cb_dt = ttk.Combobox(
-            self,
-            textvariable=self.var_d_tu,
-            width=6,
-            values=("mg", "g"),
-            state="readonly",
-        )
-        cb_dt.grid(row=4, column=2, padx=5, pady=5)
+        vcmd = (self.register(_is_num_or_empty), "%P")
+        self.factory.create_entry(self.var_d_target, 4, 1, width=8, validate="key", validatecommand=vcmd)
+        self.factory.create_combo(self.var_d_tu, self.UNITS, 4, 2, width=6)
 
         self.factory.create_label("−Tol", 4, 3)
-        self.factory.create_entry(self.var_d_tol_lo, 4, 4, width=8)
+        self.factory.create_entry(self.var_d_tol_lo, 4, 4, width=8, validate="key", validatecommand=vcmd)
         self.factory.create_label("+Tol", 4, 5)
-        self.factory.create_entry(self.var_d_tol_up, 4, 6, width=8)
-        cb_dtu = ttk.Combobox(
-            self,
-            textvariable=self.var_d_tol_u,
-            width=6,
-            values=("mg", "g"),
-            state="readonly",
-        )
-        cb_dtu.grid(row=4, column=7, padx=5, pady=5)
+        self.factory.create_entry(self.var_d_tol_up, 4, 6, width=8, validate="key", validatecommand=vcmd)
+        self.factory.create_combo(self.var_d_tol_u, self.UNITS, 4, 7, width=6)
 
         self.btn_dosing_start = self.factory.create_btn(
             "Start dosing job", self.on_start_dosing_job, 4, 8
@@ -151,11 +216,9 @@ class WinBalance(tk.LabelFrame):
         ToolTip(btn_write_head, "Écrire le nom sur le dosing head en place (WriteDosingHead)")
 
         # Layout
-        for c in range(0, 11):
-            self.grid_columnconfigure(c, weight=0)
+        self.grid_columnconfigure(tuple(range(11)), weight=0)
         self.grid_columnconfigure(10, weight=1)  # une colonne “tampon” à droite
 
-
     # ---------------------------------------------------------
     # Helpers
     def _get_wm(self) -> WM:
@@ -165,88 +228,161 @@ class WinBalance(tk.LabelFrame):
         return sc
 
     def _make_wm(self) -> WM:
-        # Endpoints lus directement depuis SCALE_CONFIG (plus d’édition UI)
-        return WM(
-            scheme=SCALE_CONFIG.get("scheme", "http"),
-            ip=SCALE_CONFIG.get("ip", "192.168.0.50"),
-            port=int(SCALE_CONFIG.get("port", 81)),
-            wsdl_path=SCALE_CONFIG.get("wsdl_path"),
-            password=SCALE_CONFIG.get("password"),
-            verify=SCALE_CONFIG.get("verify", False),
-            timeout_s=SCALE_CONFIG.get("timeout_s", 8),
-            door_ids=SCALE_CONFIG.get("door_ids", ["LeftOuter", "RightOuter"]),
-            open_width=SCALE_CONFIG.get("open_width", 100),
-            close_width=SCALE_CONFIG.get("close_width", 0),
-        )
+        # Endpoints lus depuis SCALE_CONFIG (plus d’édition UI) : kwargs figés à l'import
+        return WM(**_WM_STATIC_KWARGS)
+
+    def _run_async(self, fn, on_ok, on_err=None, *, blocking: bool = False):
+        """fn() sur le pool WS, puis on_ok(résultat) ou on_err(exception) sur le thread Tk.
+        blocking=True : exécution immédiate sur le thread appelant (séquences Auto/JSON)."""
+        on_err = on_err or partial(self._log_err, "WebService")
+        if blocking:
+            try:
+                res = fn()
+            except Exception as e:
+                on_err(e)
+                return
+            on_ok(res)
+            return
+        self._io_executor.submit(fn).add_done_callback(partial(self._deliver, on_ok, on_err))
+
+    def _deliver(self, on_ok, on_err, fut):
+        err = fut.exception()
+        try:
+            if err is None:
+                self.after(0, on_ok, fut.result())
+            else:
+                self.after(0, on_err, err)
+        except (RuntimeError, tk.TclError):
+            pass  # fenêtre détruite / mainloop arrêtée
+
+    def destroy(self):
+        if self._watch_id is not None:
+            self.after_cancel(self._watch_id)
+            self._watch_id = None
+        if self._log_flush_id is not None:
+            self.after_cancel(self._log_flush_id)
+            self._log_flush_id = None
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
+        if self._dosing_stop is not None:
+            self._dosing_stop.set()
+        super().destroy()
+
+    def _log_once(self, msg: str, level: str = "info", suppress_s: float = LOG_SUPPRESS_S):
+        """info.add sauf si (level, msg) a été affiché il y a moins de suppress_s ;
+        les répétitions masquées sont comptées puis signalées (xN) au prochain affichage."""
+        key = (level, msg)
+        now = time.monotonic()
+        last = self._log_last.get(key)
+        if last is not None and now - last < suppress_s:
+            self._log_counts[key] = self._log_counts.get(key, 0) + 1
+            return
+        n = self._log_counts.pop(key, 0)
+        self._log_last[key] = now
+        self._log_last.move_to_end(key)
+        if len(self._log_last) > LOG_ONCE_MAX:
+            old, _ = self._log_last.popitem(last=False)
+            self._log_counts.pop(old, None)
+        self.info.add(f"{msg} (x{n + 1})" if n else msg, level=level)
+
+    def _log_err(self, label: str, e: Exception):
+        self._log_once(f"{label}: {e}", level="error")
+
+    def _log_result(self, label: str, resp):
+        self.info.add(f"{label} → {resp}")
+
+    def _wm_call(self, method: str, *args, **kwargs):
+        return getattr(self._get_wm(), method)(*args, **kwargs)
+
+    def _ws_call(self, label: str, method: str, on_ok=None, *args):
+        """Raccourci : wm.<method>(*args) en asynchrone, erreurs loggées sous 'label'.
+        on_ok=None → résultat loggué « label → résultat »."""
+        self._run_async(partial(self._wm_call, method, *args),
+                        on_ok or partial(self._log_result, label), partial(self._log_err, label))
 
     # ---------------------------------------------------------
     # Connexion / Heartbeat
-    def on_connect(self):
+    def on_connect(self, *, blocking: bool = False):
         # désactive le bouton pendant la tentative
-        if self.btn_connect:
-            self.btn_connect.configure(state="disabled", text="Connecting…")
+        self._set_connect_btn("disabled", "Connecting…")
+        method_ui = (self.var_method.get() or "").strip()  # lu côté Tk avant de partir sur le pool
+        self._run_async(partial(self._connect_job, method_ui), self._on_connected,
+                        self._on_connect_failed, blocking=blocking)
+
+    def _set_connect_btn(self, state: str, text: str):
+        """Configure le bouton Connect seulement si (state, text) change."""
+        if not self.btn_connect or self._connect_btn_state == (state, text):
+            return
+        self._connect_btn_state = (state, text)
+        self.btn_connect.configure(state=state, text=text)
+
+    def _connect_job(self, method_ui: str):
+        """Thread pool : OpenSession + réveil + auto-start méthode. Les logs sont rendus côté Tk."""
+        # Client WM (WSDL parsé + session HTTP) réutilisé d'une connexion à l'autre
+        wm = self._wm
+        if wm is None:
+            wm = self._wm = self._make_wm()
+            wm.on_conn_change = self._post_conn_state
+        else:
+            wm.close()  # oublie l'ancien SessionId → nouvel OpenSession
+        wm.connect()  # OpenSession + SessionId interne
+        logs = [("Balance connectée (WebService).", "info")]
+
+        # Réveil immédiat à la connexion
         try:
-            wm = self._make_wm()
-            wm.connect()  # OpenSession + SessionId interne
-            self.devices['scale'] = wm
-            self.info.add("Balance connectée (WebService).")
-            
-            # Réveil immédiat à la connexion
+            if wm.wakeup_from_standby():
+                logs.append(("Balance réveillée (WakeupFromStandby).", "info"))
+            else:
+                logs.append(("WakeupFromStandby → déjà réveillée ou état inchangé.", "info"))
+        except Exception as e:
+            # Petit 'nudge' inoffensif qui réveille souvent l'UI SOAP
             try:
-                if wm.wakeup_from_standby():
-                    self.info.add("Balance réveillée (WakeupFromStandby).")
-                else:
-                    self.info.add("WakeupFromStandby → déjà réveillée ou état inchangé.")
+                _ = wm.get_door_positions()
+                logs.append(("WakeupFromStandby a échoué → nudge GetPosition effectué.", "info"))
+            except Exception:
+                logs.append((f"WakeupFromStandby a échoué: {e}", "warning"))
+
+        # Auto-start de la méthode sélectionnée (par défaut: DOSING), nom canonique
+        if method_ui:
+            canonical = METHOD_ALIASES.get(method_ui.upper(), method_ui)
+            try:
+                wm.set_method(canonical)
+                logs.append((f"Auto-start method '{canonical}' → OK", "info"))
             except Exception as e:
-                # Petit 'nudge' inoffensif qui réveille souvent l'UI SOAP
-                try:
-                    _ = wm.get_door_positions()
-                    self.info.add("WakeupFromStandby a échoué → nudge GetPosition effectué.")
-                except Exception:
-                    self.info.add(f"WakeupFromStandby a échoué: {e}", level="warning")
-                    
-            # Auto-start de la méthode sélectionnée (par défaut: DOSING)
-            method_ui = (self.var_method.get() or "").strip()
-            if method_ui:
-                try:
-                    wm.set_method(method_ui)
-                    self.info.add(f"Auto-start method '{method_ui}' → OK")
-                except Exception as e1:
-                    if method_ui.upper() == "DOSING":
-                        try:
-                            wm.set_method("Dosing")
-                            self.info.add("Auto-start method fallback 'Dosing' → OK")
-                            self.var_method.set("DOSING")
-                        except Exception as e2:
-                            self.info.add(f"Auto-start method '{method_ui}' échouée: {e2}", level="warning")
-                    else:
-                        self.info.add(f"Auto-start method '{method_ui}' échouée: {e1}", level="warning")
-
-            if self.btn_connect:
-                self.btn_connect.configure(state="disabled", text="Connected")
-            # remet l’état des boutons dosing
-            self._reset_dosing_buttons()
-        except Exception as e:
-            if self.btn_connect:
-                self.btn_connect.configure(state="normal", text="Connect")
-            self.info.add(f"Connexion WS échouée — {e}", level="error")
+                logs.append((f"Auto-start method '{canonical}' échouée: {e}", "warning"))
+        return wm, logs
+
+    def _on_connected(self, result):
+        wm, logs = result
+        self.devices['scale'] = wm
+        for msg, level in logs:
+            self.info.add(msg, level=level)
+        self._set_connect_btn("disabled", "Connected")
+        self._arm_watch()
+        # remet l’état des boutons dosing
+        self._reset_dosing_buttons()
+
+    def _on_connect_failed(self, e: Exception):
+        self._set_connect_btn("normal", "Connect")
+        self._log_once(f"Connexion WS échouée — {e}", level="error")
 
     def on_is_empty(self):
-        try:
-            ok, stats = self._get_wm().is_pan_empty(threshold_mg=9.0, samples=10, sleep_s=0.05)
-            if ok:
-                self.info.add(
-                    f"Plateau VIDE (Gross mean={stats['mean_gross_g']*1000:.1f} mg, "
-                    f"σ={stats['std_gross_g']*1000:.1f} mg, seuil={stats['threshold_g']*1000:.1f} mg, n={stats['n']})"
-                )
-            else:
-                self.info.add(
-                    f"Plateau OCCUPÉ (Gross mean={stats['mean_gross_g']*1000:.1f} mg, "
-                    f"σ={stats['std_gross_g']*1000:.1f} mg, seuil={stats['threshold_g']*1000:.1f} mg, n={stats['n']})",
-                    level="warning"
-                )
-        except Exception as e:
-            self.info.add(f"Is empty ?: {e}", level="error")
+        # ~10 lectures espacées de 50 ms : toujours hors du thread Tk
+        self._run_async(partial(self._wm_call, "is_pan_empty", threshold_mg=9.0, samples=10, sleep_s=0.05),
+                        self._on_is_empty, partial(self._log_err, "Is empty ?"))
+
+    def _on_is_empty(self, result):
+        ok, stats = result
+        if ok:
+            self.info.add(
+                f"Plateau VIDE (Gross mean={stats['mean_gross_g']*1000:.1f} mg, "
+                f"σ={stats['std_gross_g']*1000:.1f} mg, seuil={stats['threshold_g']*1000:.1f} mg, n={stats['n']})"
+            )
+        else:
+            self.info.add(
+                f"Plateau OCCUPÉ (Gross mean={stats['mean_gross_g']*1000:.1f} mg, "
+                f"σ={stats['std_gross_g']*1000:.1f} mg, seuil={stats['threshold_g']*1000:.1f} mg, n={stats['n']})",
+                level="warning"
+            )
 
     def _auto_connect(self):
         try:
@@ -254,265 +390,332 @@ class WinBalance(tk.LabelFrame):
         except Exception as e:
             self.info.add(f"Auto-connect échoué: {e}", level="warning")
 
+    def _post_conn_state(self, ok: bool):
+        """Callback WM.on_conn_change (thread appelant quelconque) → thread Tk."""
+        try:
+            self.after(0, self._apply_conn_state, ok)
+        except (RuntimeError, tk.TclError):
+            pass  # fenêtre détruite
+
+    def _apply_conn_state(self, ok: bool):
+        if ok:
+            self._set_connect_btn("disabled", "Connected")
+        else:
+            self._set_connect_btn("normal", "Connect")
+
+    def _arm_watch(self, delay_s: float = WATCH_IDLE_S):
+        if self._watch_id is not None:
+            self.after_cancel(self._watch_id)
+        self._watch_id = self.after(max(1, int(delay_s * 1000)), self._watch_period)
+
     def _watch_period(self):
-        """Vérifie périodiquement l'état WS ; si perdu → réactiver le bouton."""
+        """Sonde paresseuse : les appels WS (Lire poids, Tare, dosing…) signalent déjà
+        la liaison via on_conn_change ; on ne sonde qu'après WATCH_IDLE_S d'inactivité,
+        dans une thread pour ne jamais bloquer Tk."""
+        self._watch_id = None
         wm = self.devices.get('scale')
-        ok = False
-        if wm and wm.is_connected():
+        if wm is None:
+            return
+        idle = wm.seconds_since_ok()
+        if idle < WATCH_IDLE_S:
+            self._arm_watch(WATCH_IDLE_S - idle)
+        else:
+            threading.Thread(target=self._watch_probe, args=(wm,), name="scale-watch", daemon=True).start()
+
+    def _watch_probe(self, wm: WM):
+        # HEAD keep-alive d'abord ; appel SOAP complet (→ on_conn_change) seulement s'il échoue
+        ok = wm.cheap_ping()
+        if not ok:
             try:
                 _ = wm.get_door_positions()
                 ok = True
             except Exception:
                 ok = False
+        try:
+            self.after(0, self._on_watch_result, ok)
+        except (RuntimeError, tk.TclError):
+            pass  # fenêtre détruite
 
-        if ok:
-            if self.btn_connect:
-                self.btn_connect.configure(state="disabled", text="Connected")
-        else:
-            if self.btn_connect:
-                self.btn_connect.configure(state="normal", text="Connect")
-
-        self.after(WATCH_PERIOD_MS, self._watch_period)
+    def _on_watch_result(self, ok: bool):
+        self._apply_conn_state(ok)
+        self._arm_watch()
 
     # ---------------------------------------------------------
     # Actions UI basiques
     def on_open_door(self):
-        try:
-            resp = self._get_wm().open_door()
-            self.info.add(f"Open door → {resp}")
-        except Exception as e:
-            self.info.add(f"Open door: {e}", level="error")
+        self._ws_call("Open door", "open_door")
 
     def on_close_door(self):
-        try:
-            resp = self._get_wm().close_door()
-            self.info.add(f"Close door → {resp}")
-        except Exception as e:
-            self.info.add(f"Close door: {e}", level="error")
+        self._ws_call("Close door", "close_door")
 
     def on_check_door(self):
         """Lit les positions de portes et les loggue."""
-        try:
-            pos = self._get_wm().get_door_positions()
-            self.info.add(f"Door positions: {pos}")
-        except Exception as e:
-            self.info.add(f"Check door: {e}", level="error")
+        self._ws_call("Door positions", "get_door_positions", None, UI_READ_MAX_AGE_MS)
 
     def on_zero(self):
-        try:
-            resp = self._get_wm().zero()
-            self.info.add(f"Zero → {resp}")
-        except Exception as e:
-            self.info.add(f"Zero: {e}", level="error")
+        self._ws_call("Zero", "zero")
 
     def on_tare(self):
-        try:
-            resp = self._get_wm().tare()
-            self.info.add(f"Tare → {resp}")
-        except Exception as e:
-            self.info.add(f"Tare: {e}", level="error")
+        self._ws_call("Tare", "tare")
 
     def on_read(self):
-        try:
-            w_g = self._get_wm().get_weight()   # renvoie toujours en grammes côté deviceScale
-            w_mg = w_g * 1000.0
-            self.var_weight.set(f"{w_mg:.3f} mg")
-            self.info.add(f"Poids: {w_mg:.3f} mg")
-        except Exception as e:
-            self.info.add(f"Lecture: {e}", level="error")
+        # renvoie toujours en grammes côté deviceScale
+        self._ws_call("Lecture", "get_weight", self._on_weight, UI_READ_MAX_AGE_MS)
+
+    def _on_weight(self, w_g: float):
+        if not self.winfo_viewable():
+            self._pending_weight_g = w_g  # cadre masqué : rien à formater ni redessiner
+            return
+        self._pending_weight_g = None
+        text = f"{w_g * 1000.0:.3f} mg"
+        if text != self._weight_text:
+            self._weight_text = text
+            self.var_weight.set(text)
+        self.info.add(f"Poids: {text}")
+
+    def _on_map(self, _event=None):
+        if self._pending_weight_g is not None:
+            self.after_idle(self._on_weight, self._pending_weight_g)
 
     def on_start_method(self):
-        try:
-            method = self.var_method.get().strip()
-            resp = self._get_wm().set_method(method)
-            self.info.add(f"Start method '{method}' → {resp}")
-        except Exception as e:
-            self.info.add(f"Start method: {e}", level="error")
+        method = self.var_method.get().strip()
+        method = METHOD_ALIASES.get(method.upper(), method)
+        self._ws_call(f"Start method '{method}'", "set_method", None, method)
 
     # ---------------------------------------------------------
     # Dosing Automation : démarrage job + thread de notifications
+    def is_dosing_running(self) -> bool:
+        """True tant que le suivi des notifications de dosing est actif."""
+        return bool(self._dosing_thread and self._dosing_thread.is_alive())
+
     def _start_dosing_notifications_thread(self):
-        if self._dosing_thread and self._dosing_thread.is_alive():
+        if self.is_dosing_running():
             return
 
-        # (ré)initialise l’event d’arrêt
-        self._dosing_stop = threading.Event()
-
         # UI : bloquer Start, activer Cancel
         if self.btn_dosing_start:
             self.btn_dosing_start.configure(state="disabled")
-        if hasattr(self, "btn_dosing_cancel") and self.btn_dosing_cancel:
+        if self.btn_dosing_cancel:
             self.btn_dosing_cancel.configure(state="normal")
 
-        def _worker():
-            def log_cb(msg: str):
-                self.after(0, lambda m=msg: self.info.add(m))
-            try:
-                self._get_wm().auto_confirm_dosing_notifications(
-                    log_cb=log_cb,
-                    verbose=True,
-                    long_poll_s=10,
-                    stop_event=self._dosing_stop,  # <<< passe l’event
-                )
-                self.after(0, lambda: self.info.add("DosingAutomation terminé (auto-confirm)."))
-            except Exception as e:
-                self.after(0, lambda: self.info.add(f"Erreur auto-confirm dosing: {e}", level="error"))
-            finally:
-                # UI : réactiver Start, désactiver Cancel
-                self.after(0, self._reset_dosing_buttons)
-
-        self._dosing_thread = threading.Thread(target=_worker, daemon=True)
+        self._dosing_stop = stop = threading.Event()
+        self._dosing_token = token = object()
+        self._dosing_thread = threading.Thread(
+            target=self._dosing_worker, args=(self._get_wm(), stop, token),
+            name="scale-dosing", daemon=True,
+        )
         self._dosing_thread.start()
+        if self._log_flush_id is None:
+            self._log_flush_id = self.after(LOG_FLUSH_MS, self._flush_log_buf)
+
+    def _dosing_worker(self, wm: WM, stop: threading.Event, token: object):
+        try:
+            wm.auto_confirm_dosing_notifications(log_cb=self._buffer_log, verbose=True,
+                                                 stop_event=stop)
+            self._buffer_log("DosingAutomation terminé (auto-confirm).")
+        except Exception as e:
+            self._buffer_log(f"Erreur auto-confirm dosing: {e}", level="error")
+        finally:
+            # sentinelle de CE job : le vidage réactive Start / désactive Cancel
+            self._log_q_put(token)
+
+    def _buffer_log(self, msg: str, level: str = "info"):
+        """Appelé depuis le thread dosing : un simple put, aucun appel Tk.
+        File pleine → le plus ancien message est abandonné (le worker ne bloque jamais)."""
+        self._log_q_put((msg, level))
+
+    def _log_q_put(self, item):
+        while True:
+            try:
+                self._log_q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._log_q.get_nowait()
+                    self._log_dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _drain_log_buf(self) -> bool:
+        """Vide (au plus LOG_FLUSH_MAX messages) côté Tk ; True si la sentinelle du job
+        courant a été lue (celles d'un job précédent sont ignorées)."""
+        batch, done = [], False
+        while len(batch) < LOG_FLUSH_MAX:
+            try:
+                item = self._log_q.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(item, tuple):
+                if item is self._dosing_token:
+                    done = True
+                    break
+                continue
+            batch.append(item)
+        if self._log_dropped:
+            n, self._log_dropped = self._log_dropped, 0
+            batch.insert(0, (f"{n} message(s) de dosing non affichés (rafale).", "warning"))
+        # une insertion Text par suite de messages de même niveau
+        i = 0
+        while i < len(batch):
+            level = batch[i][1]
+            j = i
+            while j < len(batch) and batch[j][1] == level:
+                j += 1
+            self.info.add_many([m for m, _ in batch[i:j]], level=level)
+            i = j
+        return done
+
+    def _flush_log_buf(self):
+        if self._drain_log_buf():
+            # worker terminé : réactiver Start, désactiver Cancel
+            self._log_flush_id = None
+            self._reset_dosing_buttons()
+        else:
+            self._log_flush_id = self.after(LOG_FLUSH_MS, self._flush_log_buf)
 
     def _reset_dosing_buttons(self):
         if self.btn_dosing_start:
             self.btn_dosing_start.configure(state="normal")
-        if hasattr(self, "btn_dosing_cancel") and self.btn_dosing_cancel:
+        if self.btn_dosing_cancel:
             self.btn_dosing_cancel.configure(state="disabled")
 
-    def on_start_dosing_job(self):
+    def on_start_dosing_job(self, *, blocking: bool = False):
+        # Formulaire lu côté Tk ; pré-checks + envoi partent sur le pool WS
         try:
-            # --- A) Fermer la/les porte(s) AVANT tout le reste ---
-            try:
-                resp = self._get_wm().close_door()  # politique robuste (_drive_doors)
-                self.info.add(f"Close door → {resp}")
-            except Exception as e_close:
-                self.info.add(f"Impossible de fermer la porte: {e_close}", level="error")
-                return  # on ne lance pas le job si on ne peut pas fermer
-
-            # --- 0) Dispenser présent ? ---
-            head_name = (self._get_wm().get_dosing_head_name() or "").strip()
-            if not head_name:
-                self.info.add(
-                    "Aucun dispenser détecté (ReadDosingHead vide). "
-                    "Place un dosing head puis relance.",
-                    level="warning"
-                )
-                return
-
-            # --- 1) Vial présente ? ---
-            min_present_mg = float(SCALE_CONFIG.get("vial_presence_min_mg", 1000.0))
-            has_vial, stats = self._get_wm().is_pan_present(
-                min_present_mg=min_present_mg, samples=8, sleep_s=0.04
+            form = DosingForm(
+                vial   = self.var_d_vial.get().strip(),
+                sub    = self.var_d_substance.get().strip(),
+                tgt    = _parse_num(self.var_d_target.get()),
+                t_unit = self.var_d_tu.get(),
+                tol_lo = _parse_num(self.var_d_tol_lo.get()),
+                tol_up = _parse_num(self.var_d_tol_up.get()),
+                tol_u  = self.var_d_tol_u.get(),
             )
-            if not has_vial:
-                self.info.add(
-                    "Aucune vial détectée sur le plateau — je ne lance pas le job. "
-                    f"(Gross≈{(stats['mean_gross_g'] or 0)*1000:.1f} mg, "
-                    f"seuil≈{stats['threshold_g']*1000:.1f} mg)",
-                    level="warning"
-                )
-                return
-
-            # → pré-checks OK : gérer l’UI
-            if self.btn_dosing_start:
-                self.btn_dosing_start.configure(state="disabled")
-            if hasattr(self, "btn_dosing_cancel") and self.btn_dosing_cancel:
-                self.btn_dosing_cancel.configure(state="normal")
-
-            # (facultatif) synchro substance si champ vide
-            if not (self.var_d_substance.get() or "").strip():
-                self.var_d_substance.set(head_name)
-
-            # --- 2) S'assurer que la méthode 'Dosing' est active ---
-            method = self.var_method.get().strip().lower()
-            if method != "dosing":
-                self.info.add("La méthode active n'est pas 'Dosing' → je la démarre avant le job.")
-                self._get_wm().set_method("Dosing")
-                self.var_method.set("DOSING")
-
-            # --- 3) Paramètres et envoi ---
-            vial   = self.var_d_vial.get().strip()
-            sub    = self.var_d_substance.get().strip()
-            tgt    = float(self.var_d_target.get())
-            t_unit = self.var_d_tu.get()
-            tol_lo = float(self.var_d_tol_lo.get())
-            tol_up = float(self.var_d_tol_up.get())
-            tol_u  = self.var_d_tol_u.get()
-
-            resp = self._get_wm().start_dosing_job(
-                vial_name=vial,
-                substance_name=sub,
-                target_value=tgt,
-                target_unit=t_unit,
-                lower_tol_value=tol_lo,
-                upper_tol_value=tol_up,
-                tol_unit=tol_u,
-            )
-
-            out   = resp.get("Outcome")
-            cmd   = resp.get("CommandId")
-            err   = resp.get("ErrorMessage")
-            s_err = resp.get("StartDosingJobListError")
-            jerr  = resp.get("JobErrors")
-
-            msg = f"Dosing job '{vial}' / '{sub}' {tgt:g}{t_unit} (−{tol_lo:g}{tol_u}/+{tol_up:g}{tol_u})"
-            if out:  msg += f" → Outcome={out}"
-            if cmd:  msg += f", CommandId={cmd}"
-            if s_err: msg += f", StartError={s_err}"
-            if err:   msg += f", Error={err}"
-            if jerr:  msg += f", JobErrors={jerr}"
-            self.info.add(msg)
-
-            if out == "Success" and not s_err:
-                self._start_dosing_notifications_thread()
-
-        except Exception as e:
+        except (tk.TclError, ValueError) as e:
             self.info.add(f"Start dosing job: {e}", level="error")
+            return
+        # Anti-rebond (clics UI seulement) : même formulaire < 2 s → ignoré
+        now = time.monotonic()
+        if (not blocking and form == self._last_job_form
+                and now - self._last_job_mono < DOSING_DEBOUNCE_S):
+            self.info.add("Start dosing job: même job déjà envoyé, ignoré.", level="warning")
+            return
+        self._last_job_form, self._last_job_mono = form, now
+        # pas de double clic pendant les pré-checks
+        if self.btn_dosing_start:
+            self.btn_dosing_start.configure(state="disabled")
+        self._run_async(partial(self._dosing_job, form), self._on_dosing_job_sent,
+                        self._on_dosing_job_failed, blocking=blocking)
+
+    def _dosing_job(self, form: DosingForm) -> dict:
+        """Thread pool : pré-checks + StartDosingJob en un appel WM.
+        Retourne {'logs': [(msg, level)], 'ok': bool, ...} rendu par _on_dosing_job_sent."""
+        out = self._get_wm().prepare_and_start_dosing(
+            vial_name=form.vial,
+            substance_name=form.sub,
+            target_value=form.tgt,
+            target_unit=form.t_unit,
+            lower_tol_value=form.tol_lo,
+            upper_tol_value=form.tol_up,
+            tol_unit=form.tol_u,
+            min_present_mg=float(SCALE_CONFIG.get("vial_presence_min_mg", 1000.0)),
+        )
+        resp = out["resp"]
+        if resp is None:
+            return out  # pré-check en échec, déjà loggué
+
+        res   = resp.get("Outcome")
+        cmd   = resp.get("CommandId")
+        err   = resp.get("ErrorMessage")
+        s_err = resp.get("StartDosingJobListError")
+        jerr  = resp.get("JobErrors")
+
+        vial, tgt, t_unit = form.vial, form.tgt, form.t_unit
+        tol_lo, tol_up, tol_u = form.tol_lo, form.tol_up, form.tol_u
+        sub = out["substance"] or form.sub
+        msg = f"Dosing job '{vial}' / '{sub}' {tgt:g}{t_unit} (−{tol_lo:g}{tol_u}/+{tol_up:g}{tol_u})"
+        if res:  msg += f" → Outcome={res}"
+        if cmd:  msg += f", CommandId={cmd}"
+        if s_err: msg += f", StartError={s_err}"
+        if err:   msg += f", Error={err}"
+        if jerr:  msg += f", JobErrors={jerr}"
+        out["logs"].append((msg, "info"))
+        return out
+
+    def _on_dosing_job_sent(self, out: dict):
+        for msg, level in out["logs"]:
+            self.info.add(msg, level=level)
+        if out["substance"]:
+            self.var_d_substance.set(out["substance"])
+        if out["method_set"]:
+            self.var_method.set("DOSING")
+        if out["ok"]:
+            self._start_dosing_notifications_thread()
+        else:
+            self._last_job_form = None  # job non lancé : relance immédiate permise
             self._reset_dosing_buttons()
-    
+
+    def _on_dosing_job_failed(self, e: Exception):
+        self._log_once(f"Start dosing job: {e}", level="error")
+        self._last_job_form = None
+        self._reset_dosing_buttons()
+
     def on_cancel_dosing_job(self):
-        # 1) Demande d’annulation côté WS (priorité: Dosing → Task → CommandId)
-        try:
-            r = self._get_wm().cancel_dosing_job_list()
-            self.info.add(f"CancelCurrentDosingJobListAsync → Outcome={r.get('Outcome')} CmdId={r.get('CommandId')}")
-            if r.get("Outcome") not in (None, "Success"):
-                # fallback #1 : annuler la tâche courante
-                r2 = self._get_wm().cancel_current_task()
-                self.info.add(f"CancelCurrentTask → Outcome={r2.get('Outcome')}")
-                if r2.get("Outcome") not in (None, "Success"):
-                    # fallback #2 : annuler par CommandId si on en a un
-                    r3 = self._get_wm().cancel_command()
-                    self.info.add(f"Session.Cancel(CommandId) → Outcome={r3.get('Outcome')}")
-        except Exception as e:
-            self.info.add(f"Annulation WS a échoué: {e}", level="warning")
+        # 1) Demande d’annulation côté WS, sur le pool (pas de gel si la balance traîne)
+        self._run_async(self._cancel_job, self._on_cancel_sent, self._on_cancel_failed)
 
-        # 2) Signale l’arrêt au worker local (polling des notifs)
-        if self._dosing_stop:
+        # 2) Arrête le suivi local des notifs (sans join côté Tk) : le poll en vol
+        #    (rendu tôt par la notification de fin d'annulation) est encore traité,
+        #    puis la sentinelle réactive Start
+        if self._dosing_stop is not None:
             self._dosing_stop.set()
 
-        # 3) Joindre rapidement le thread pour calmer les logs
-        if self._dosing_thread and self._dosing_thread.is_alive():
-            try:
-                self._dosing_thread.join(timeout=0.5)
-            except Exception:
-                pass
-
         self.info.add("Cancel demandé → envoi de l'annulation et arrêt du polling en cours.")
-        self._reset_dosing_buttons()
+        if self.btn_dosing_cancel:
+            self.btn_dosing_cancel.configure(state="disabled")
+
+    def _cancel_job(self) -> list[str]:
+        """Thread pool : annulation WS (priorité: Dosing → Task → CommandId) ; lignes de log."""
+        wm = self._get_wm()
+        r = wm.cancel_dosing_job_list()
+        logs = [f"CancelCurrentDosingJobListAsync → Outcome={r.get('Outcome')} CmdId={r.get('CommandId')}"]
+        if r.get("Outcome") not in (None, "Success"):
+            # fallback #1 : annuler la tâche courante
+            r2 = wm.cancel_current_task()
+            logs.append(f"CancelCurrentTask → Outcome={r2.get('Outcome')}")
+            if r2.get("Outcome") not in (None, "Success"):
+                # fallback #2 : annuler par CommandId si on en a un
+                r3 = wm.cancel_command()
+                logs.append(f"Session.Cancel(CommandId) → Outcome={r3.get('Outcome')}")
+        return logs
+
+    def _on_cancel_sent(self, logs: list[str]):
+        self.info.add_many(logs)
+
+    def _on_cancel_failed(self, e: Exception):
+        self._log_once(f"Annulation WS a échoué: {e}", level="warning")
 
     # ---------------------------------------------------------
     # Dosing Head : lecture / écriture
     def on_read_dosing_head(self):
         """Lit le nom du dosing head en place via ReadDosingHead et aligne aussi la substance du job."""
-        try:
-            name = self._get_wm().get_dosing_head_name().strip()
-            self.var_dosing_head.set(name)
-            self.var_d_substance.set(name)
-            self.info.add(f"Dosing head lu: {name or '—'}")
-        except Exception as e:
-            self.info.add(f"Read dosing head: {e}", level="error")
+        self._ws_call("Read dosing head", "get_dosing_head_name", self._on_dosing_head_read, UI_READ_MAX_AGE_MS)
+
+    def _on_dosing_head_read(self, name: str):
+        name = name.strip()
+        self.var_dosing_head.set(name)
+        self.var_d_substance.set(name)
+        self.info.add(f"Dosing head lu: {name or '—'}")
 
     def on_write_dosing_head(self):
         """Écrit le nom dans le dosing head via WriteDosingHead et aligne aussi la substance du job."""
-        try:
-            name = self.var_dosing_head.get().strip()
-            if not name:
-                self.info.add("Nom de dosing head vide → rien à écrire.", level="warning")
-                return
+        name = self.var_dosing_head.get().strip()
+        if not name:
+            self.info.add("Nom de dosing head vide → rien à écrire.", level="warning")
+            return
+        self._ws_call("Write dosing head", "set_dosing_head_name",
+                      partial(self._on_dosing_head_written, name), name)
 
-            resp = self._get_wm().set_dosing_head_name(name)
-            self.var_d_substance.set(name)
-            self.info.add(f"Dosing head écrit: '{name}' → {resp}")
-        except Exception as e:
-            self.info.add(f"Write dosing head: {e}", level="error")
+    def _on_dosing_head_written(self, name: str, resp):
+        self.var_d_substance.set(name)
+        self.info.add(f"Dosing head écrit: '{name}' → {resp}")
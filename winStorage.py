@@ -6,16 +6,18 @@
 import tkinter as tk
 import tkinter.ttk as ttk
 
-from guiUtils import GUIFactory, ToolTip
+from guiUtils import GUIFactory, SharedToolTip
+
+_DEFAULT_STORAGE_CONFIG = {
+    "ids": ["S1", "S2", "S3", "S4"],
+    "order": ["S1", "S2", "S3", "S4"],  # TL, TR, BL, BR
+    "labels": {"S1":"S1","S2":"S2","S3":"S3","S4":"S4"},
+}
 
 try:
-    from config import STORAGE_CONFIG
-except Exception:
-    STORAGE_CONFIG = {
-        "ids": ["S1", "S2", "S3", "S4"],
-        "order": ["S1", "S2", "S3", "S4"],  # TL, TR, BL, BR
-        "labels": {"S1":"S1","S2":"S2","S3":"S3","S4":"S4"},
-    }
+    from config import STORAGE_CONFIG as _CFG
+except ImportError:
+    _CFG = None
 
 
 class WinStorage(tk.LabelFrame):
@@ -30,9 +32,10 @@ class WinStorage(tk.LabelFrame):
         self.factory = GUIFactory(self)
 
         # Config
-        ids = list(STORAGE_CONFIG.get("ids", ["S1","S2","S3","S4"]))
-        order = list(STORAGE_CONFIG.get("order", ids))
-        labels = dict(STORAGE_CONFIG.get("labels", {i: i for i in ids}))
+        cfg = _CFG or _DEFAULT_STORAGE_CONFIG
+        ids = list(cfg.get("ids", ["S1","S2","S3","S4"]))
+        order = list(cfg.get("order", ids))
+        labels = dict(cfg.get("labels", {i: i for i in ids}))
 
         # Sanity: garde 4 éléments et corrige silencieusement si nécessaire
         def _take4(seq, fill=None):
@@ -48,6 +51,10 @@ class WinStorage(tk.LabelFrame):
         # Membre: ordre visuel TL, TR, BL, BR
         self._order_visual = order           # ex: ["S1","S2","S3","S4"]
         self._labels = labels                # ex: {"S1":"S1", ...}
+        # ID logique → index visuel (1re occurrence, comme list.index)
+        self._id_to_index: dict[str, int] = {}
+        for i, sid in enumerate(order):
+            self._id_to_index.setdefault(sid, i)
 
         # Une seule sélection -> IntVar (index 0..3 dans order)
         self.var_storage_index = tk.IntVar(value=-1)
@@ -73,6 +80,7 @@ class WinStorage(tk.LabelFrame):
             (1, 1),  # BR
         ]
 
+        tips = SharedToolTip(self)
         for idx, (r, c) in enumerate(positions):
             slot_id = self._order_visual[idx]
             text = self._labels.get(slot_id, slot_id)
@@ -89,20 +97,14 @@ class WinStorage(tk.LabelFrame):
             )
             rb.grid(row=r, column=c, padx=8, pady=6, sticky="w")
             self._storage_buttons.append(rb)
-            ToolTip(rb, f"Storage {slot_id}")
+            tips.add(rb, f"Storage {slot_id}")
 
         # (optionnel) layout propre
-        for c in range(2):
-            self.grid_columnconfigure(c, weight=0)
+        self.grid_columnconfigure((0, 1), weight=0)
 
     def _reset_selection(self):
-        """Aucune sélection au démarrage."""
+        """Aucune sélection : -1 ne correspond à aucune valeur du groupe."""
         self.var_storage_index.set(-1)
-        for rb in self._storage_buttons:
-            try:
-                rb.deselect()
-            except Exception:
-                pass
 
     # ------------------------------------------------------------------
     # API publique
@@ -120,12 +122,11 @@ class WinStorage(tk.LabelFrame):
         """
         Force une sélection à partir de l'ID logique (S1..S4).
         """
-        try:
-            idx = self._order_visual.index(storage_id)
-        except ValueError:
+        idx = self._id_to_index.get(storage_id)
+        if idx is None:
             self._reset_selection()
-            return
-        self.var_storage_index.set(idx)
+        else:
+            self.var_storage_index.set(idx)
 
     def log_selected(self):
         """Log la sélection actuelle si info_win est fourni."""
@@ -4,151 +4,213 @@
 #-------------------------------------------------------------------------------
 
 import tkinter as tk
-import tkinter.ttk as ttk
+from tkinter import font as tkfont
 
-from guiUtils import GUIFactory, ToolTip
+from guiUtils import GUIFactory, CanvasToolTip
 
 
+def _unroll_layout(layout) -> tuple[tuple[str, int, int], ...]:
+    """
+    Déplie un layout [("E1",4), ("E2",3), ...] en (vial_id, ligne, colonne relative).
+    Quinconce : E1/E3/F1/F3 sur les lignes 1,3,5,7 ; E2/F2 sur les lignes 2,4,6.
+    """
+    table = []
+    for col_off, (col_name, count) in enumerate(layout):
+        for i in range(1, count + 1):
+            if col_name.endswith("1") or col_name.endswith("3"):
+                row = 1 + (i - 1) * 2      # 1,3,5,7
+            elif col_name.endswith("2"):
+                row = 2 + (i - 1) * 2      # 2,4,6
+            else:
+                row = i
+            table.append((f"{col_name}-{i}", row, col_off))
+    return tuple(table)
+
 
 class WinVials(tk.LabelFrame):
     """
     Sous-panneau pour choisir des vials parmi plusieurs positions.
-    Il y a deux groupes indépendants de Radiobuttons :
+    Les vials sont des ronds dessinés sur un seul Canvas (clic = sélection).
+    Il y a deux groupes :
       - groupe E* : E1, E2, E3 (avec 4,3,4 vials)
       - groupe F* : F1, F2, F3 (avec 4,3,4 vials)
-    Chaque groupe a une seule sélection possible.
+    Une seule vial sélectionnée à la fois, tous groupes confondus (l'UR3
+    traite une vial par cycle).
     """
 
+    # Layout : (nom_colonne, nombre_de_vials)
+    VIALS_LAYOUT_E = (("E1", 4), ("E2", 3), ("E3", 4))
+    VIALS_LAYOUT_F = (("F1", 4), ("F2", 3), ("F3", 4))
+
+    # Positions dépliées une fois pour toutes : (vial_id, ligne, colonne relative)
+    _LAYOUT_E = _unroll_layout(VIALS_LAYOUT_E)
+    _LAYOUT_F = _unroll_layout(VIALS_LAYOUT_F)
+
+    # Ids de vials par groupe ("E1-1", ..., "F3-4"), dans l'ordre des index :
+    # énumérables sans instancier le panneau
+    VIAL_IDS_E = tuple(vid for vid, _row, _col in _LAYOUT_E)
+    VIAL_IDS_F = tuple(vid for vid, _row, _col in _LAYOUT_F)
+
+    # vial_id -> index dans son groupe (setters en O(1))
+    _VIAL_ID_TO_IDX_E = {vid: idx for idx, vid in enumerate(VIAL_IDS_E)}
+    _VIAL_ID_TO_IDX_F = {vid: idx for idx, vid in enumerate(VIAL_IDS_F)}
+
+    # Valeurs de var_vial : E* -> 0..N_E-1, F* -> N_E + index F
+    _N_E = len(VIAL_IDS_E)
+
+    # Géométrie du Canvas (pixels) : une cellule par (ligne, colonne) de la grille
+    COL_W = 20
+    ROW_H = 14
+    VIAL_R = 5
+    SEP_COL = 3             # colonne du séparateur entre E* et F*
+    N_COLS = 7
+    N_ROWS = 8              # ligne 0 = entêtes, lignes 1..7 = vials
+    VIAL_FILL = "white"
+    VIAL_SEL_FILL = "black"
+    SEP_FILL = "gray50"     # séparateur = simple ligne Canvas (pas de ttk.Separator)
+
     def __init__(self, parent, info_win=None, title: str = "Vials"):
         super().__init__(parent, text=title)
         self.info = info_win
         self.factory = GUIFactory(self)
 
-        # Petite police pour gagner en hauteur
-        self.small_font = ("TkDefaultFont", 8)
-
-        # Deux variables d'index indépendantes : une pour E*, une pour F*
-        # -1 = aucune sélection
-        self.var_vial_index_c = tk.IntVar(value=-1)
-        self.var_vial_index_f = tk.IntVar(value=-1)
-
-        # Layout : (nom_colonne, nombre_de_vials)
-        self.vials_layout_c = [
-            ("E1", 4),
-            ("E2", 3),
-            ("E3", 4),
-        ]
-        self.vials_layout_f = [
-            ("F1", 4),
-            ("F2", 3),
-            ("F3", 4),
-        ]
-
-        # stockage pour mapping index -> "E1-1", "F2-3", etc.
-        self._vial_ids_c: list[str] = []
-        self._vial_buttons_c: list[tk.Radiobutton] = []
-
-        self._vial_ids_f: list[str] = []
-        self._vial_buttons_f: list[tk.Radiobutton] = []
+        # Petite police pour gagner en hauteur : un seul objet Font (résolu une fois
+        # par Tk), partagé par tous les textes du Canvas
+        self.small_font = tkfont.Font(self, family="TkDefaultFont", size=8)
 
-        self._build()
+        # Une seule variable pour les deux groupes (voir _N_E) ; -1 = aucune sélection
+        self.var_vial = tk.IntVar(value=-1)
+        # Sélection décodée, tenue à jour par la trace (getters sans aller-retour Tcl)
+        self._cached_e: str | None = None
+        self._cached_f: str | None = None
+        self.var_vial.trace_add("write", self._on_vial_changed)
 
-        # Important : forcer l'état "aucune sélection" APRÈS construction
-        self.after(0, self._reset_selection)
+        # item Canvas de chaque rond (index = valeur de var_vial)
+        self._ovals: list[int] = []
+        # item -> valeur de var_vial, pour le clic
+        self._oval_value: dict[int, int] = {}
+        # rond actuellement rempli
+        self._sel_oval: int | None = None
+
+        self._build()
 
     # ------------------------------------------------------------------
     # Construction UI
     # ------------------------------------------------------------------
-    def _build_group(self, base_col: int, layout, var_index, ids_list, btn_list):
+    def _cell_center(self, row: int, col: int) -> tuple[int, int]:
+        return col * self.COL_W + self.COL_W // 2, row * self.ROW_H + self.ROW_H // 2
+
+    def _build_group(self, base_col: int, headers, layout_table, value_offset: int, cmds):
         """
-        Construit un groupe de vials en quinconce, à partir d'une colonne de base.
+        Prépare le dessin d'un groupe de vials en quinconce, à partir d'une colonne de base.
         base_col: colonne de départ (0 pour E*, 4 par ex. pour F*)
-        layout: [("E1",4), ("E2",3), ("E3",4)] ou équivalent
-        var_index: IntVar pour ce groupe
-        ids_list: liste où on pousse les ids ("E1-1",...)
-        btn_list: liste où on pousse les Radiobuttons
-        """
-        idx = 0  # index pour ce groupe
-
-        for offset_col, (col_name, count) in enumerate(layout):
-            col = base_col + offset_col
-
-            # Entête de colonne
-            lbl = tk.Label(self, text=col_name, font=self.small_font)
-            lbl.grid(row=0, column=col, pady=(0, 1))
-
-            for i in range(1, count + 1):
-                # Calcul de la ligne en fonction de la colonne pour faire la quinconce
-                if col_name.endswith("1") or col_name.endswith("3"):
-                    # E1/E3/F1/F3 : lignes 1,3,5,7 (4 vials)
-                    # (quand count=3, seules 3 lignes seront utilisées)
-                    row = 1 + (i - 1) * 2      # 1,3,5,7
-                elif col_name.endswith("2"):
-                    # E2/F2 : lignes 2,4,6
-                    row = 2 + (i - 1) * 2      # 2,4,6
-                else:
-                    row = i
-
-                vial_id = f"{col_name}-{i}"
-                ids_list.append(vial_id)
-
-                rb = tk.Radiobutton(
-                    self,
-                    variable=var_index,
-                    value=idx,              # chaque bouton a un index unique dans SON groupe
-                    indicatoron=True,       # rond
-                    font=self.small_font,
-                    padx=0,
-                    pady=0,
-                    borderwidth=0,
-                    highlightthickness=0,
-                )
-                rb.grid(row=row, column=col, padx=3, pady=0)
-
-                btn_list.append(rb)
-                ToolTip(rb, f"Vial {vial_id}")
-
-                idx += 1
+        headers: [("E1",4), ("E2",3), ("E3",4)] ou équivalent (entêtes de colonnes)
+        layout_table: positions dépliées (vial_id, ligne, colonne relative)
+        value_offset: valeur de var_vial du premier rond du groupe (0 pour E*, _N_E pour F*)
+        cmds: (commande Tcl "create ...", vial ou None) accumulées, exécutées en un
+              seul eval par _build
+        """
+        cv = self._canvas
+        r = self.VIAL_R
+
+        # Entêtes de colonnes
+        for col_off, (col_name, _count) in enumerate(headers):
+            x, y = self._cell_center(0, base_col + col_off)
+            cmds.append((f"{cv} create text {x} {y} -text {col_name} -font {self.small_font}", None))
+
+        # idx = index unique de chaque rond dans SON groupe
+        for idx, (vial_id, row, col_off) in enumerate(layout_table):
+            x, y = self._cell_center(row, base_col + col_off)
+            cmds.append((
+                f"{cv} create oval {x - r} {y - r} {x + r} {y + r}"
+                f" -fill {self.VIAL_FILL} -outline black -tags vial",
+                (value_offset + idx, vial_id),
+            ))
 
     def _build(self):
         """
-        Construit deux groupes de vials en quinconce, compacts :
+        Dessine deux groupes de vials en quinconce, compacts :
           - groupe E* à gauche (E1, E2, E3)
           - groupe F* à droite (F1, F2, F3)
         """
+        self._canvas = cv = tk.Canvas(
+            self,
+            width=self.N_COLS * self.COL_W,
+            height=self.N_ROWS * self.ROW_H,
+            highlightthickness=0,
+        )
+        cv.grid(row=0, column=0, padx=3, pady=(0, 3))
+
+        # Une seule info-bulle et un seul clic pour tous les ronds (tag "vial")
+        self._tips = CanvasToolTip(cv, "vial")
+        cv.tag_bind("vial", "<Button-1>", self._on_vial_click)
+
+        # Items du Canvas : un seul script Tcl à la fin
+        cmds: list[tuple[str, tuple | None]] = []
+
         # Groupe E* : colonnes 0,1,2
         self._build_group(
             base_col=0,
-            layout=self.vials_layout_c,
-            var_index=self.var_vial_index_c,
-            ids_list=self._vial_ids_c,
-            btn_list=self._vial_buttons_c,
+            headers=self.VIALS_LAYOUT_E,
+            layout_table=self._LAYOUT_E,
+            value_offset=0,
+            cmds=cmds,
         )
 
-        # Séparateur vertical en colonne 3
-        # On le fait partir de row=0 jusqu'à row=8 (ça couvre largement tous les ronds).
-        sep = ttk.Separator(self, orient="vertical")
-        sep.grid(row=0, column=3, rowspan=8, sticky="ns", padx=5)
+        # Séparateur vertical en colonne 3, sur toute la hauteur
+        x, _y = self._cell_center(0, self.SEP_COL)
+        cmds.append((f"{cv} create line {x} 0 {x} {self.N_ROWS * self.ROW_H} -fill {self.SEP_FILL}", None))
 
         # Groupe F* : colonnes 4,5,6 (on laisse la colonne 3 comme espace visuel)
         self._build_group(
             base_col=4,
-            layout=self.vials_layout_f,
-            var_index=self.var_vial_index_f,
-            ids_list=self._vial_ids_f,
-            btn_list=self._vial_buttons_f,
+            headers=self.VIALS_LAYOUT_F,
+            layout_table=self._LAYOUT_F,
+            value_offset=self._N_E,
+            cmds=cmds,
         )
 
+        # Un seul aller-retour Python→Tcl ; "list [..] [..]" renvoie les ids des items
+        items = self.tk.splitlist(self.tk.eval("list " + " ".join(f"[{c}]" for c, _v in cmds)))
+        for oid, (_cmd, vial) in zip(map(int, items), cmds):
+            if vial is None:
+                continue
+            value, vial_id = vial
+            self._ovals.append(oid)
+            self._oval_value[oid] = value
+            self._tips.add(oid, f"Vial {vial_id}")
+
+    def _on_vial_click(self, _event=None):
+        hit = self._canvas.find_withtag("current")
+        if hit and hit[0] in self._oval_value:
+            self.var_vial.set(self._oval_value[hit[0]])
+
+    def _on_vial_changed(self, *_trace):
+        """Trace unique de var_vial (clic, setters, reset) : cache des ids + dessin."""
+        value = self.var_vial.get()
+        n_e = self._N_E
+        self._cached_e = self.VIAL_IDS_E[value] if 0 <= value < n_e else None
+        self._cached_f = (self.VIAL_IDS_F[value - n_e]
+                          if 0 <= value - n_e < len(self.VIAL_IDS_F) else None)
+        self._paint_selection(value)
+
+    def _paint_selection(self, value: int):
+        """Vide le rond précédemment sélectionné et remplit le nouveau."""
+        cv = self._canvas
+        prev = self._sel_oval
+        if prev is not None:
+            cv.itemconfigure(prev, fill=self.VIAL_FILL)
+        cur = self._ovals[value] if 0 <= value < len(self._ovals) else None
+        if cur is not None:
+            cv.itemconfigure(cur, fill=self.VIAL_SEL_FILL)
+        self._sel_oval = cur
+
     def _reset_selection(self):
         """
-        Force l'état initial : aucune vial sélectionnée dans les deux groupes.
+        Force l'état initial : aucune vial sélectionnée.
+        -1 ne correspond à aucun rond : la trace vide le rond sélectionné.
         """
-        self.var_vial_index_c.set(-1)
-        self.var_vial_index_f.set(-1)
-        for rb in self._vial_buttons_c:
-            rb.deselect()
-        for rb in self._vial_buttons_f:
-            rb.deselect()
+        self.var_vial.set(-1)
 
     # ------------------------------------------------------------------
     # API publique
@@ -157,19 +219,13 @@ class WinVials(tk.LabelFrame):
         """
         Retourne la vial sélectionnée dans le groupe E* (ex: 'E2-3') ou None.
         """
-        idx = self.var_vial_index_c.get()
-        if 0 <= idx < len(self._vial_ids_c):
-            return self._vial_ids_c[idx]
-        return None
+        return self._cached_e
 
     def get_selected_vial_f(self) -> str | None:
         """
         Retourne la vial sélectionnée dans le groupe F* (ex: 'F1-2') ou None.
         """
-        idx = self.var_vial_index_f.get()
-        if 0 <= idx < len(self._vial_ids_f):
-            return self._vial_ids_f[idx]
-        return None
+        return self._cached_f
 
     # Pour compatibilité avec ton ancienne API : on retourne le groupe E par défaut
     def get_selected_vial(self) -> str | None:
@@ -177,23 +233,19 @@ class WinVials(tk.LabelFrame):
 
     def set_selected_vial_c(self, vial_id: str) -> None:
         """
-        Force une sélection dans le groupe E*.
+        Force une sélection dans le groupe E* (remplace toute sélection F*).
         """
-        try:
-            idx = self._vial_ids_c.index(vial_id)
-        except ValueError:
-            return
-        self.var_vial_index_c.set(idx)
+        idx = self._VIAL_ID_TO_IDX_E.get(vial_id)
+        if idx is not None:
+            self.var_vial.set(idx)
 
     def set_selected_vial_f(self, vial_id: str) -> None:
         """
-        Force une sélection dans le groupe F*.
+        Force une sélection dans le groupe F* (remplace toute sélection E*).
         """
-        try:
-            idx = self._vial_ids_f.index(vial_id)
-        except ValueError:
-            return
-        self.var_vial_index_f.set(idx)
+        idx = self._VIAL_ID_TO_IDX_F.get(vial_id)
+        if idx is not None:
+            self.var_vial.set(self._N_E + idx)
 
     def log_selected(self):
         """